@@ -3,7 +3,9 @@
 Availability checking job and related functions.
 Monitors requested media and notifies users when items become available.
 """
+import asyncio
 import logging
+import os
 from typing import Dict, Any, Optional
 from telegram.ext import ContextTypes
 from overseerr_api import get_canonical_status
@@ -11,25 +13,57 @@ from database import get_watchlist, update_watchlist
 
 logger = logging.getLogger(__name__)
 
+# Bound how many entries are checked concurrently so we don't overwhelm
+# Radarr/Sonarr/Overseerr when the watchlist is large.
+_sem = asyncio.Semaphore(int(os.getenv("AVAIL_CONCURRENCY", "10")))
+
 
 async def check_availability_job(context: ContextTypes.DEFAULT_TYPE):
     """
     Periodic job that checks watchlist for availability.
     - Reads watchlist from database
     - Checks each entry's availability via Radarr/Sonarr APIs (real-time)
+    - Entries are checked concurrently (bounded by AVAIL_CONCURRENCY)
     - Notifies on transition to AVAILABLE/PARTIALLY_AVAILABLE
     - Prunes available entries from watchlist
     """
     watchlist = get_watchlist()
-    
+
     if not watchlist:
         logger.info("Watchlist is empty. Skipping check.")
         return
 
-    remaining = []
+    # Per-sweep memoization: entries sharing a media_id (e.g. several seasons
+    # of one show) reuse the same Overseerr responses instead of re-fetching.
+    details_cache: Dict[tuple, Any] = {}
+    status_cache: Dict[tuple, Any] = {}
+
+    # Bulk prefetch: answer as much of the sweep as possible from one
+    # Radarr fetch and one Sonarr fetch, instead of per-entry round trips.
+    # Entries the prefetch can't answer (e.g. TV without a cached tvdb_id)
+    # fall through to the per-entry path below.
+    bulk_movies: Dict[int, tuple] = {}
+    bulk_tv: Dict[tuple, tuple] = {}
+    try:
+        from radarr_sonarr_api import get_radarr_sonarr_api
+        api = get_radarr_sonarr_api()
+        if api:
+            movie_ids = [w["media_id"] for w in watchlist if w.get("media_type") == "movie"]
+            tv_items = [
+                (w["tvdb_id"], w.get("season"))
+                for w in watchlist
+                if w.get("media_type") == "tv" and w.get("tvdb_id")
+            ]
+            if movie_ids:
+                bulk_movies = await asyncio.to_thread(api.check_movies_bulk, movie_ids)
+            if tv_items:
+                bulk_tv = await asyncio.to_thread(api.check_tv_bulk, tv_items)
+    except Exception as e:
+        logger.warning(f"Bulk Radarr/Sonarr prefetch failed, using per-entry checks: {e}")
 
-    for w in list(watchlist):
-        try:
+    async def _check_entry(w):
+        """Check one watchlist entry. Returns True to keep tracking it."""
+        async with _sem:
             media_id = w.get("media_id")
             media_type = w.get("media_type")  # "movie" | "tv"
             chat_id = w.get("chat_id")
@@ -43,25 +77,48 @@ async def check_availability_job(context: ContextTypes.DEFAULT_TYPE):
             try:
                 from radarr_sonarr_api import get_radarr_sonarr_api
                 api = get_radarr_sonarr_api()
-                
+
                 if api and media_type == "movie":
-                    is_available, data = api.check_movie_availability(media_id)
+                    result = bulk_movies.get(media_id)
+                    if result is None:
+                        result = await api.check_movie_availability_async(media_id)
+                    is_available, data = result
                     is_now_available = is_available
                     logger.info(f"[Radarr API] {media_type} {media_id} available={is_available}")
                 elif api and media_type == "tv":
-                    # Need to get tvdb_id from Overseerr
-                    from overseerr_api import get_details
-                    details = get_details(media_id, "tv")
-                    tvdb_id = details.get("externalIds", {}).get("tvdbId")
+                    # Prefer the tvdb_id cached on the entry; only fall back
+                    # to an Overseerr details fetch when it's missing, and
+                    # write it back so later sweeps skip the fetch entirely.
+                    tvdb_id = w.get("tvdb_id")
+                    if not tvdb_id:
+                        from overseerr_api import get_details
+                        details_key = (media_id, "tv")
+                        details = details_cache.get(details_key)
+                        if details is None:
+                            details = await asyncio.to_thread(get_details, media_id, "tv")
+                            details_cache[details_key] = details
+                        tvdb_id = details.get("externalIds", {}).get("tvdbId")
+                        if tvdb_id:
+                            w["tvdb_id"] = tvdb_id
                     if tvdb_id:
-                        is_available, data = api.check_tv_availability(tvdb_id, season_number=season)
+                        result = bulk_tv.get((tvdb_id, season))
+                        if result is None:
+                            result = await api.check_tv_availability_async(tvdb_id, season_number=season)
+                        is_available, data = result
                         is_now_available = is_available
                         logger.info(f"[Sonarr API] {media_type} {media_id} season {season} available={is_available}")
             except Exception as e:
                 logger.warning(f"Radarr/Sonarr API check failed, falling back to Overseerr: {e}")
                 # Fall back to Overseerr canonical status
                 requested = [season] if (media_type == "tv" and season is not None) else None
-                status, meta = get_canonical_status(media_id, media_type, requested_seasons=requested)
+                status_key = (media_id, media_type, tuple(requested) if requested else None)
+                cached = status_cache.get(status_key)
+                if cached is None:
+                    cached = await asyncio.to_thread(
+                        get_canonical_status, media_id, media_type, requested_seasons=requested
+                    )
+                    status_cache[status_key] = cached
+                status, meta = cached
                 is_now_available = status in ("AVAILABLE", "PARTIALLY_AVAILABLE")
                 logger.info(f"[Overseerr fallback] {media_type} {media_id} status={status}")
 
@@ -85,22 +142,31 @@ async def check_availability_job(context: ContextTypes.DEFAULT_TYPE):
                     except Exception:
                         logger.exception("Failed to notify chat_id=%s for %s %s", chat_id, media_type, media_id)
                 # Stop tracking this entry
-                continue
+                return False
 
             # Still not available → keep tracking
             w["last_known_status"] = "checking"
-            remaining.append(w)
+            return True
+
+    results = await asyncio.gather(
+        *(_check_entry(w) for w in watchlist),
+        return_exceptions=True
+    )
 
-        except Exception:
-            logger.exception("Availability check failed for entry: %r", w)
+    remaining = []
+    for w, keep in zip(watchlist, results):
+        if isinstance(keep, BaseException):
+            logger.error("Availability check failed for entry %r: %r", w, keep)
             # Keep it so we try again next run
             remaining.append(w)
-    
+        elif keep:
+            remaining.append(w)
+
     before = len(watchlist)
     after = len(remaining)
     logger.info("Availability check: pruned %d item(s); %d → %d pending", before - after, before, after)
 
-    # Update watchlist in database
+    # Update watchlist in database (single write for the whole sweep)
     update_watchlist(remaining)
 
 
@@ -2,16 +2,42 @@
 """
 Database backup and restore functionality.
 """
+import asyncio
 import os
 import logging
 import shutil
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# zstandard compresses the JSON files 5-10x at near-memcpy decompression
+# speed; fall back to raw copies when it isn't installed.
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+ZSTD_LEVEL = 3
+
+# xxhash (xxh3 runs at ~10 GB/s) is used for cheap change detection so
+# unchanged databases don't produce new backups; hashlib is the fallback.
+try:
+    import xxhash
+
+    def _file_hash(path: str) -> str:
+        with open(path, "rb") as f:
+            return xxhash.xxh3_64(f.read()).hexdigest()
+except ImportError:
+    import hashlib
+
+    def _file_hash(path: str) -> str:
+        with open(path, "rb") as f:
+            return hashlib.md5(f.read()).hexdigest()
+
 # Backup directory
 BACKUP_DIR = Path("/home/azra3l/overseerrbot_telegram/backups")
 BACKUP_DIR.mkdir(exist_ok=True)
@@ -31,20 +57,52 @@ def create_backup() -> Optional[str]:
         Path to backup directory, or None if failed
     """
     try:
+        # Skip the whole backup if nothing changed since the last one
+        current_hashes = {
+            os.path.basename(fp): _file_hash(fp)
+            for fp in DATABASE_FILES if os.path.exists(fp)
+        }
+        previous = list_backups()
+        if current_hashes and previous:
+            prev_info_file = BACKUP_DIR / previous[0] / "backup_info.json"
+            try:
+                if prev_info_file.exists():
+                    with open(prev_info_file) as f:
+                        prev_info = json.load(f)
+                    if prev_info.get("hashes") == current_hashes:
+                        logger.info("No database changes since last backup, skipping")
+                        return str(BACKUP_DIR / previous[0])
+            except Exception:
+                logger.warning("Could not read previous backup info for change detection")
+
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = BACKUP_DIR / f"backup_{timestamp}"
         backup_path.mkdir()
-        
+
         backup_info = {
             "timestamp": datetime.now().isoformat(),
-            "files": []
+            "files": [],
+            "hashes": current_hashes
         }
-        
-        for file_path in DATABASE_FILES:
-            if os.path.exists(file_path):
+        if zstd is not None:
+            backup_info["compression"] = {"suffix": ".zst", "level": ZSTD_LEVEL}
+        
+        def _copy_one(fp):
+            dest = backup_path / os.path.basename(fp)
+            if zstd is not None:
+                cctx = zstd.ZstdCompressor(level=ZSTD_LEVEL)
+                with open(fp, "rb") as src, open(f"{dest}.zst", "wb") as dst:
+                    cctx.copy_stream(src, dst)
+            else:
+                shutil.copy2(fp, dest)
+
+        existing_paths = [fp for fp in DATABASE_FILES if os.path.exists(fp)]
+        if existing_paths:
+            # Copy files in parallel; they're independent of each other
+            with ThreadPoolExecutor(max_workers=len(existing_paths)) as ex:
+                list(ex.map(_copy_one, existing_paths))
+            for file_path in existing_paths:
                 filename = os.path.basename(file_path)
-                dest = backup_path / filename
-                shutil.copy2(file_path, dest)
                 backup_info["files"].append(filename)
                 logger.info(f"Backed up {filename}")
         
@@ -84,16 +142,29 @@ def restore_backup(backup_name: str) -> bool:
                 backup_info = json.load(f)
                 logger.info(f"Restoring backup from {backup_info.get('timestamp')}")
         
-        # Restore each file
+        # Restore each file (compressed .zst backups or raw copies)
         for file_path in DATABASE_FILES:
             filename = os.path.basename(file_path)
             backup_file = backup_path / filename
-            
-            if backup_file.exists():
+            zst_file = backup_path / f"{filename}.zst"
+
+            if zst_file.exists():
+                if zstd is None:
+                    logger.error(f"Backup {zst_file} is compressed but zstandard is not installed")
+                    return False
+                # Create backup of current file before restoring
+                if os.path.exists(file_path):
+                    shutil.copy2(file_path, f"{file_path}.pre-restore")
+
+                dctx = zstd.ZstdDecompressor()
+                with open(zst_file, "rb") as src, open(file_path, "wb") as dst:
+                    dctx.copy_stream(src, dst)
+                logger.info(f"Restored {filename} (decompressed)")
+            elif backup_file.exists():
                 # Create backup of current file before restoring
                 if os.path.exists(file_path):
                     shutil.copy2(file_path, f"{file_path}.pre-restore")
-                
+
                 shutil.copy2(backup_file, file_path)
                 logger.info(f"Restored {filename}")
         
@@ -113,8 +184,17 @@ def list_backups() -> list:
         List of backup directory names sorted by date (newest first)
     """
     try:
-        backups = [d.name for d in BACKUP_DIR.iterdir() if d.is_dir() and d.name.startswith("backup_")]
-        return sorted(backups, reverse=True)
+        # scandir returns DirEntry objects whose is_dir()/stat() results come
+        # from the directory read itself, avoiding a stat() syscall per entry.
+        # Sorting by mtime (not name) also stays correct for out-of-order dirs.
+        with os.scandir(BACKUP_DIR) as it:
+            backups = [
+                (e.name, e.stat().st_mtime)
+                for e in it
+                if e.is_dir(follow_symlinks=False) and e.name.startswith("backup_")
+            ]
+        backups.sort(key=lambda x: -x[1])
+        return [name for name, _ in backups]
     except Exception as e:
         logger.exception(f"Failed to list backups: {e}")
         return []
@@ -134,12 +214,13 @@ def cleanup_old_backups(keep_last: int = 10):
             return
         
         to_delete = backups[keep_last:]
-        
+
+        # Delete old backup directories in parallel
+        with ThreadPoolExecutor(max_workers=min(len(to_delete), 4)) as ex:
+            list(ex.map(lambda name: shutil.rmtree(BACKUP_DIR / name), to_delete))
         for backup_name in to_delete:
-            backup_path = BACKUP_DIR / backup_name
-            shutil.rmtree(backup_path)
             logger.info(f"Deleted old backup: {backup_name}")
-        
+
         logger.info(f"Cleaned up {len(to_delete)} old backup(s)")
         
     except Exception as e:
@@ -149,11 +230,12 @@ def cleanup_old_backups(keep_last: int = 10):
 async def scheduled_backup(context):
     """Job function for scheduled backups."""
     logger.info("Running scheduled backup...")
-    backup_path = create_backup()
-    
+    # Run off the event loop so the bot stays responsive during the backup
+    backup_path = await asyncio.to_thread(create_backup)
+
     if backup_path:
         # Cleanup old backups
-        cleanup_old_backups(keep_last=10)
+        await asyncio.to_thread(cleanup_old_backups, 10)
         logger.info("Scheduled backup completed successfully")
     else:
         logger.error("Scheduled backup failed")
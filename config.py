@@ -3,7 +3,9 @@
 Configuration module with environment variable support and validation.
 All sensitive data should be stored in environment variables.
 """
+import functools
 import os
+import re
 import sys
 import logging
 from typing import Dict
@@ -35,28 +37,30 @@ def _get_env(key: str, required: bool = True, default: str = None) -> str:
     return value
 
 
+# One-pass "Name:ID" extractor; the lazy name group plus the ,/end anchor
+# lets names contain colons (the ID is the last :-separated field).
+_LIB_RE = re.compile(r"\s*([^,]+?)\s*:\s*(\d+)\s*(?:,|$)")
+
+
+@functools.lru_cache(maxsize=None)
 def _parse_libraries(env_var: str) -> Dict[str, int]:
     """
     Parse library configuration from environment variable.
     Format: "Name1:ID1,Name2:ID2,Name3:ID3"
     Example: "🎬 Animated:27,🇮🇳 Tamil:33,🇺🇸 English:35"
+    Memoized per env var so repeated imports don't re-parse.
     """
-    libraries = {}
     raw = os.getenv(env_var, "")
     if not raw:
-        return libraries
-    
-    try:
-        for item in raw.split(","):
-            item = item.strip()
-            if not item:
-                continue
-            name, lib_id = item.rsplit(":", 1)
-            libraries[name.strip()] = int(lib_id.strip())
-    except (ValueError, AttributeError) as e:
-        raise ConfigurationError(f"Invalid format for {env_var}: {e}")
-    
-    return libraries
+        return {}
+
+    matches = _LIB_RE.findall(raw)
+
+    expected = sum(1 for item in raw.split(",") if item.strip())
+    if len(matches) != expected:
+        raise ConfigurationError(f"Invalid format for {env_var}: expected Name:ID pairs, got {raw!r}")
+
+    return {name: int(lib_id) for name, lib_id in matches}
 
 
 def validate_config():
@@ -3,10 +3,17 @@
 Centralized data persistence layer with Postgres and JSON support.
 Writes to both Postgres (primary) and JSON (backup) for request logs.
 """
+import asyncio
+import atexit
 import json
 import os
 import logging
-from typing import Any, Dict, List, Optional
+import signal
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 from config import (
     REQUESTS_LOG_FILE, AVAILABILITY_WATCH_FILE,
@@ -16,22 +23,40 @@ from config import (
 
 logger = logging.getLogger(__name__)
 
-# Postgres connection (lazy loaded)
-_pg_conn = None
+# orjson is 3-10x faster than stdlib json and emits bytes directly;
+# fall back to stdlib so the bot still runs without it.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Postgres connection pool (lazy loaded)
+_pg_pool = None
 _pg_enabled = POSTGRES_ENABLED
 
+# Server-side prepared statement for the hot insert path; prepared once per
+# pooled connection so Postgres skips parse/plan on every log_request.
+_LOG_REQ_PREPARE = f"""
+    PREPARE log_req_stmt (text, text, text, int, text, timestamp, int, int) AS
+    INSERT INTO {POSTGRES_SCHEMA}.telegram_requests
+    (user_name, title, media_type, season, library_name, requested_at, tmdb_id, overseerr_request_id)
+    VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+"""
+
+
+def _get_pg_pool():
+    """Get or create the Postgres connection pool."""
+    global _pg_pool, _pg_enabled
 
-def _get_postgres_connection():
-    """Get or create Postgres connection."""
-    global _pg_conn, _pg_enabled
-    
     if not _pg_enabled:
         return None
-    
-    if _pg_conn is None or _pg_conn.closed:
+
+    if _pg_pool is None:
         try:
-            import psycopg2
-            _pg_conn = psycopg2.connect(
+            from psycopg2.pool import ThreadedConnectionPool
+            _pg_pool = ThreadedConnectionPool(
+                minconn=1,
+                maxconn=8,
                 host=POSTGRES_HOST,
                 port=POSTGRES_PORT,
                 database=POSTGRES_DATABASE,
@@ -39,13 +64,62 @@ def _get_postgres_connection():
                 password=POSTGRES_PASSWORD,
                 connect_timeout=5
             )
-            logger.info("Postgres connection established for request logging")
+            logger.info("Postgres connection pool established for request logging")
         except Exception as e:
             logger.error(f"Failed to connect to Postgres: {e}")
             _pg_enabled = False  # Disable for this session
             return None
-    
-    return _pg_conn
+
+    return _pg_pool
+
+
+# ids of pooled connections whose statements are already prepared —
+# psycopg2's C connection type rejects arbitrary attributes, so the flag
+# can't live on the connection itself. Pooled connections are referenced
+# by the pool for the process lifetime, so their ids stay valid.
+_prepared_conn_ids = set()
+
+
+def _prepare_statements(conn):
+    """Prepare server-side statements once per pooled connection."""
+    if id(conn) in _prepared_conn_ids:
+        return
+    try:
+        cursor = conn.cursor()
+        cursor.execute(_LOG_REQ_PREPARE)
+        conn.commit()
+        cursor.close()
+    except Exception as e:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        # "already exists" means a previous checkout prepared it — fine
+        from psycopg2 import errors as pg_errors
+        if not isinstance(e, pg_errors.DuplicatePreparedStatement):
+            logger.warning(f"Failed to prepare Postgres statements: {e}")
+            return
+    _prepared_conn_ids.add(id(conn))
+
+
+@contextmanager
+def _pg_conn():
+    """Check a connection out of the pool; yields None if Postgres is off."""
+    pool = _get_pg_pool()
+    if pool is None:
+        yield None
+        return
+    try:
+        conn = pool.getconn()
+    except Exception as e:
+        logger.error(f"Failed to get Postgres connection from pool: {e}")
+        yield None
+        return
+    try:
+        _prepare_statements(conn)
+        yield conn
+    finally:
+        pool.putconn(conn)
 
 
 def _load_json(path: str, default: Any) -> Any:
@@ -53,6 +127,9 @@ def _load_json(path: str, default: Any) -> Any:
     try:
         if not os.path.exists(path):
             return default
+        if orjson is not None:
+            with open(path, "rb") as f:
+                return orjson.loads(f.read())
         with open(path, "r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
@@ -60,29 +137,198 @@ def _load_json(path: str, default: Any) -> Any:
         return default
 
 
+# Hash of the bytes last written per path, so re-saving identical content
+# (e.g. an availability sweep that changed nothing) skips the disk entirely.
+_last_written_hash: Dict[str, int] = {}
+
+
 def _save_json(path: str, data: Any) -> bool:
     """Save data to JSON file with error handling."""
     try:
+        # Serialize first; skip the write when the bytes are unchanged.
+        # No pretty-printing here — these files are on the hot path.
+        if orjson is not None:
+            buf = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+        else:
+            buf = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        h = hash(buf)
+        if _last_written_hash.get(path) == h:
+            return True
+
         # Ensure directory exists
         os.makedirs(os.path.dirname(path), exist_ok=True)
-        
-        # Write to temporary file first, then rename (atomic operation)
+
+        # Single os.write to a temp fd, then rename (atomic operation)
         temp_path = f"{path}.tmp"
-        with open(temp_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        
-        # Atomic rename
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, buf)
+        finally:
+            os.close(fd)
+
         os.replace(temp_path, path)
+        _last_written_hash[path] = h
         return True
     except Exception as e:
         logger.exception(f"Failed to save {path}: {e}")
         return False
 
 
+# ============================================================================
+# Delayed-Write JSON Store
+# ============================================================================
+
+class _JsonStore:
+    """
+    In-memory cache of JSON-backed files with delayed (coalesced) writes.
+
+    Mutations mark a file dirty; a background flusher (see run_store_flusher)
+    writes dirty files at most once per flush window, so a burst of watchlist
+    changes costs a single disk write instead of one per mutation.
+    """
+
+    def __init__(self, flush_delay: float = 0.5):
+        self.flush_delay = flush_delay
+        self._cache: Dict[str, Any] = {}
+        self._dirty: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, path: str, default: Any) -> Any:
+        """Return the cached data for a file, loading it from disk once."""
+        with self._lock:
+            if path in self._cache:
+                return self._cache[path]
+        data = _load_json(path, default)
+        with self._lock:
+            return self._cache.setdefault(path, data)
+
+    def mark_dirty(self, path: str, data: Any):
+        """Record new data for a file; it will be written on the next flush."""
+        with self._lock:
+            self._cache[path] = data
+            self._dirty[path] = time.time()
+
+    def flush(self) -> bool:
+        """Write all dirty files to disk. Returns False if any write failed."""
+        with self._lock:
+            pending = {path: self._cache[path] for path in self._dirty}
+            self._dirty.clear()
+        ok = True
+        for path, data in pending.items():
+            if not _save_json(path, data):
+                ok = False
+        return ok
+
+
+_store = _JsonStore()
+
+
+async def run_store_flusher():
+    """Background task that periodically flushes the delayed-write store."""
+    while True:
+        await asyncio.sleep(_store.flush_delay)
+        try:
+            _store.flush()
+        except Exception:
+            logger.exception("JSON store flush failed")
+
+
+def _flush_store_at_exit():
+    _store.flush()
+
+
+atexit.register(_flush_store_at_exit)
+
+try:
+    _prev_sigterm = signal.getsignal(signal.SIGTERM)
+
+    def _flush_on_sigterm(signum, frame):
+        _store.flush()
+        if callable(_prev_sigterm):
+            _prev_sigterm(signum, frame)
+        else:
+            raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _flush_on_sigterm)
+except (ValueError, OSError):
+    # Not on the main thread; atexit flush still applies
+    pass
+
+
 # ============================================================================
 # Request Logging
 # ============================================================================
 
+# JSON-Lines variant of the request log: one json.dumps(entry) per line,
+# appended in "a" mode so logging a request is O(1) instead of a full
+# read/append/rewrite of the whole log file.
+REQUESTS_LOG_FILE_JSONL = REQUESTS_LOG_FILE + "l"
+
+
+def _dump_jsonl_line(entry: Dict) -> bytes:
+    """Serialize one request-log entry to a newline-terminated bytes line."""
+    if orjson is not None:
+        return orjson.dumps(entry) + b"\n"
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def _migrate_to_jsonl():
+    """One-shot migration of the legacy .json request log to JSONL."""
+    try:
+        if os.path.exists(REQUESTS_LOG_FILE_JSONL) or not os.path.exists(REQUESTS_LOG_FILE):
+            return
+        logs = _load_json(REQUESTS_LOG_FILE, [])
+        if not isinstance(logs, list):
+            return
+        os.makedirs(os.path.dirname(REQUESTS_LOG_FILE_JSONL), exist_ok=True)
+        with open(REQUESTS_LOG_FILE_JSONL, "wb") as f:
+            for entry in logs:
+                f.write(_dump_jsonl_line(entry))
+        logger.info(f"Migrated {len(logs)} request log entries to {REQUESTS_LOG_FILE_JSONL}")
+    except Exception as e:
+        logger.error(f"Failed to migrate request log to JSONL: {e}")
+
+
+_migrate_to_jsonl()
+
+
+def _append_jsonl_log(entry: Dict) -> bool:
+    """Append one entry to the JSONL request log."""
+    try:
+        os.makedirs(os.path.dirname(REQUESTS_LOG_FILE_JSONL), exist_ok=True)
+        with open(REQUESTS_LOG_FILE_JSONL, "ab") as f:
+            f.write(_dump_jsonl_line(entry))
+        return True
+    except Exception as e:
+        logger.exception(f"Failed to append to {REQUESTS_LOG_FILE_JSONL}: {e}")
+        return False
+
+
+def _iter_jsonl_log() -> Iterator[Dict]:
+    """Stream entries from the JSONL request log (oldest first)."""
+    path = REQUESTS_LOG_FILE_JSONL if os.path.exists(REQUESTS_LOG_FILE_JSONL) else REQUESTS_LOG_FILE
+    if not os.path.exists(path):
+        return
+    if path == REQUESTS_LOG_FILE:
+        # Legacy .json log (pre-migration)
+        for entry in _load_json(path, []):
+            yield entry
+        return
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except Exception:
+                    logger.warning(f"Skipping malformed JSONL line in {path}")
+    except Exception as e:
+        logger.error(f"Failed to read {path}: {e}")
+
+
 def log_request(
     telegram_user: str,
     media_title: str,
@@ -110,33 +356,27 @@ def log_request(
     
     # Try Postgres first
     pg_success = False
-    conn = _get_postgres_connection()
-    if conn:
-        try:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"""
-                INSERT INTO {POSTGRES_SCHEMA}.telegram_requests 
-                (user_name, title, media_type, season, library_name, requested_at, tmdb_id, overseerr_request_id)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """,
-                (telegram_user, media_title, media_type, season, library_name, timestamp, tmdb_id, overseerr_request_id)
-            )
-            conn.commit()
-            cursor.close()
-            pg_success = True
-            logger.info(f"[PG] Logged request: {media_title} by {telegram_user}")
-        except Exception as e:
-            logger.error(f"Failed to log request to Postgres: {e}")
+    with _pg_conn() as conn:
+        if conn:
             try:
-                conn.rollback()
-            except:
-                pass
+                cursor = conn.cursor()
+                cursor.execute(
+                    "EXECUTE log_req_stmt (%s, %s, %s, %s, %s, %s, %s, %s)",
+                    (telegram_user, media_title, media_type, season, library_name, timestamp, tmdb_id, overseerr_request_id)
+                )
+                conn.commit()
+                cursor.close()
+                pg_success = True
+                logger.info(f"[PG] Logged request: {media_title} by {telegram_user}")
+            except Exception as e:
+                logger.error(f"Failed to log request to Postgres: {e}")
+                try:
+                    conn.rollback()
+                except:
+                    pass
     
-    # Always write to JSON as backup
-    logs = _load_json(REQUESTS_LOG_FILE, [])
-    logs.append(entry)
-    json_success = _save_json(REQUESTS_LOG_FILE, logs)
+    # Always append to JSONL as backup
+    json_success = _append_jsonl_log(entry)
     
     if json_success and not pg_success:
         logger.warning(f"[JSON] Request logged to JSON only (Postgres unavailable)")
@@ -144,166 +384,437 @@ def log_request(
     return pg_success or json_success
 
 
-def get_user_requests(telegram_user: str, limit: int = 10) -> List[Dict]:
-    """Get requests for a specific user (tries Postgres first, falls back to JSON)."""
-    conn = _get_postgres_connection()
-    if conn:
+# Background write queue so handlers never block on the Postgres INSERT +
+# commit + JSONL append. Entries are drained in batches by run_log_writer.
+_log_queue: "Optional[asyncio.Queue]" = None
+_LOG_BATCH_SIZE = 32
+
+
+def _get_log_queue() -> "asyncio.Queue":
+    global _log_queue
+    if _log_queue is None:
+        _log_queue = asyncio.Queue()
+    return _log_queue
+
+
+async def log_request_async(
+    telegram_user: str,
+    media_title: str,
+    media_type: str,
+    season: int = None,
+    library_name: str = None,
+    tmdb_id: int = None,
+    overseerr_request_id: int = None
+) -> bool:
+    """
+    Non-blocking variant of log_request: enqueue the entry and return.
+    The background writer batches queued entries into a single INSERT.
+    """
+    timestamp = datetime.now()
+    entry = {
+        "user": telegram_user,
+        "title": media_title,
+        "type": media_type,
+        "season": season,
+        "library": library_name,
+        "timestamp": timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        "overseerr_request_id": overseerr_request_id,
+        "tmdb_id": tmdb_id,
+    }
+    row = (telegram_user, media_title, media_type, season, library_name, timestamp, tmdb_id, overseerr_request_id)
+    await _get_log_queue().put((entry, row))
+    return True
+
+
+def _write_log_batch(batch):
+    """Write a batch of (entry, row) pairs to Postgres and the JSONL log."""
+    rows = [row for _, row in batch]
+    pg_success = False
+    with _pg_conn() as conn:
+        if conn:
+            try:
+                from psycopg2.extras import execute_values
+                cursor = conn.cursor()
+                execute_values(
+                    cursor,
+                    f"""
+                    INSERT INTO {POSTGRES_SCHEMA}.telegram_requests
+                    (user_name, title, media_type, season, library_name, requested_at, tmdb_id, overseerr_request_id)
+                    VALUES %s
+                    """,
+                    rows
+                )
+                conn.commit()
+                cursor.close()
+                pg_success = True
+                logger.info(f"[PG] Logged batch of {len(rows)} request(s)")
+            except Exception as e:
+                logger.error(f"Failed to log request batch to Postgres: {e}")
+                try:
+                    conn.rollback()
+                except:
+                    pass
+
+    for entry, _ in batch:
+        _append_jsonl_log(entry)
+
+    if not pg_success:
+        logger.warning("[JSON] Request batch logged to JSON only (Postgres unavailable)")
+
+
+async def run_log_writer():
+    """Background task that drains the request-log queue in batches."""
+    queue = _get_log_queue()
+    while True:
+        batch = [await queue.get()]
         try:
-            cursor = conn.cursor()
-            cursor.execute(
-                f"""
-                SELECT id, user_name, title, media_type, season, library_name, 
-                       TO_CHAR(requested_at, 'YYYY-MM-DD HH24:MI:SS') as timestamp,
-                       tmdb_id, overseerr_request_id
-                FROM {POSTGRES_SCHEMA}.telegram_requests
-                WHERE user_name = %s
-                ORDER BY requested_at DESC
-                LIMIT %s
-                """,
-                (telegram_user, limit)
-            )
-            rows = cursor.fetchall()
-            cursor.close()
-            
-            # Convert to dict format matching JSON
-            results = []
-            for row in rows:
-                results.append({
-                    "id": row[0],
-                    "user": row[1],
-                    "title": row[2],
-                    "type": row[3],
-                    "season": row[4],
-                    "library": row[5],
-                    "timestamp": row[6],
-                    "tmdb_id": row[7],
-                    "overseerr_request_id": row[8],
-                })
-            
-            logger.info(f"[PG] Retrieved {len(results)} requests for {telegram_user}, first result: {results[0] if results else 'none'}")
-            return results
-        except Exception as e:
-            logger.exception(f"Failed to get user requests from Postgres: {e}")
+            while len(batch) < _LOG_BATCH_SIZE:
+                batch.append(queue.get_nowait())
+        except asyncio.QueueEmpty:
+            pass
+        try:
+            await asyncio.to_thread(_write_log_batch, batch)
+        except Exception:
+            logger.exception("Request log writer batch failed")
+
+
+def _row_to_request(row) -> Dict:
+    """Convert a telegram_requests row to the dict format the JSON log uses."""
+    return {
+        "id": row[0],
+        "user": row[1],
+        "title": row[2],
+        "type": row[3],
+        "season": row[4],
+        "library": row[5],
+        "timestamp": row[6],
+        "tmdb_id": row[7],
+        "overseerr_request_id": row[8],
+    }
+
+
+_REQUEST_COLUMNS = """id, user_name, title, media_type, season, library_name,
+                      TO_CHAR(requested_at, 'YYYY-MM-DD HH24:MI:SS') as timestamp,
+                      tmdb_id, overseerr_request_id"""
+
+
+def get_user_requests(telegram_user: str, limit: int = 10, offset: int = 0) -> List[Dict]:
+    """Get a page of requests for a specific user (tries Postgres first, falls back to JSON)."""
+    with _pg_conn() as conn:
+        if conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT {_REQUEST_COLUMNS}
+                    FROM {POSTGRES_SCHEMA}.telegram_requests
+                    WHERE user_name = %s
+                    ORDER BY requested_at DESC
+                    LIMIT %s OFFSET %s
+                    """,
+                    (telegram_user, limit, offset)
+                )
+                rows = cursor.fetchall()
+                cursor.close()
+
+                results = [_row_to_request(row) for row in rows]
+                logger.info(f"[PG] Retrieved {len(results)} requests for {telegram_user}, first result: {results[0] if results else 'none'}")
+                return results
+            except Exception as e:
+                logger.exception(f"Failed to get user requests from Postgres: {e}")
+
+    # Fallback to JSONL; keep only the tail we need while streaming.
+    # The file is chronological, so the page is the newest offset+limit
+    # entries minus the newest offset.
+    tail = deque(
+        (r for r in _iter_jsonl_log() if r.get("user") == telegram_user),
+        maxlen=offset + limit
+    )
+    rows = list(tail)
+    if offset:
+        rows = rows[:-offset] if offset < len(rows) else []
+    return rows
+
+
+def get_user_request_by_id(telegram_user: str, req_id: int) -> Optional[Dict]:
+    """Fetch a single request by id, scoped to the requesting user."""
+    with _pg_conn() as conn:
+        if conn:
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    f"""
+                    SELECT {_REQUEST_COLUMNS}
+                    FROM {POSTGRES_SCHEMA}.telegram_requests
+                    WHERE user_name = %s AND id = %s
+                    """,
+                    (telegram_user, req_id)
+                )
+                row = cursor.fetchone()
+                cursor.close()
+                return _row_to_request(row) if row else None
+            except Exception as e:
+                logger.exception(f"Failed to get request {req_id} from Postgres: {e}")
+
+    # JSONL entries carry no database id, so there is nothing to match on
+    for r in _iter_jsonl_log():
+        if r.get("user") == telegram_user and r.get("id") == req_id:
+            return r
+    return None
+
+
+def iter_all_requests(limit: int = None) -> Iterator[Dict]:
+    """
+    Stream all requests (tries Postgres first, falls back to JSON).
+    Uses a server-side cursor so rows arrive in batches of 1000 instead of
+    materializing the whole history in memory.
+    """
+    yielded = False
+    with _pg_conn() as conn:
+        if conn:
+            try:
+                with conn.cursor(name="all_reqs") as cursor:
+                    cursor.itersize = 1000
+                    sql = f"""
+                        SELECT user_name, title, media_type, season, library_name,
+                               TO_CHAR(requested_at, 'YYYY-MM-DD HH24:MI:SS') as timestamp
+                        FROM {POSTGRES_SCHEMA}.telegram_requests
+                        ORDER BY requested_at DESC
+                    """
+                    if limit:
+                        sql += f" LIMIT {limit}"
+
+                    cursor.execute(sql)
+                    for row in cursor:
+                        yielded = True
+                        yield {
+                            "user": row[0],
+                            "title": row[1],
+                            "type": row[2],
+                            "season": row[3],
+                            "library": row[4],
+                            "timestamp": row[5]
+                        }
+                return
+            except Exception as e:
+                logger.error(f"Failed to get all requests from Postgres: {e}")
+                if yielded:
+                    # Partial Postgres results already streamed; don't mix in JSON
+                    return
     
-    # Fallback to JSON
-    logs = _load_json(REQUESTS_LOG_FILE, [])
-    user_requests = [r for r in logs if r["user"] == telegram_user]
-    return user_requests[-limit:]
+    # Fallback to JSONL
+    if limit:
+        yield from deque(_iter_jsonl_log(), maxlen=limit)
+    else:
+        yield from _iter_jsonl_log()
 
 
 def get_all_requests(limit: int = None) -> List[Dict]:
-    """Get all requests (tries Postgres first, falls back to JSON)."""
-    conn = _get_postgres_connection()
-    if conn:
+    """Get all requests as a list (see iter_all_requests for streaming)."""
+    return list(iter_all_requests(limit))
+
+
+# Indexes backing the GROUP BY aggregates below; created lazily on first use.
+_stats_indexes_ready = False
+
+
+def _ensure_stats_indexes(conn):
+    """Create the stats indexes once per process."""
+    global _stats_indexes_ready
+    if _stats_indexes_ready:
+        return
+    try:
+        cursor = conn.cursor()
+        for col in ("user_name", "library_name", "title", "media_type", "requested_at"):
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_telegram_requests_{col} "
+                f"ON {POSTGRES_SCHEMA}.telegram_requests ({col})"
+            )
+        conn.commit()
+        cursor.close()
+        _stats_indexes_ready = True
+    except Exception as e:
+        logger.warning(f"Failed to ensure stats indexes: {e}")
         try:
-            cursor = conn.cursor()
-            sql = f"""
-                SELECT user_name, title, media_type, season, library_name,
-                       TO_CHAR(requested_at, 'YYYY-MM-DD HH24:MI:SS') as timestamp
-                FROM {POSTGRES_SCHEMA}.telegram_requests
-                ORDER BY requested_at DESC
-            """
-            if limit:
-                sql += f" LIMIT {limit}"
-            
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-            cursor.close()
-            
-            # Convert to dict format
-            results = []
-            for row in rows:
-                results.append({
-                    "user": row[0],
-                    "title": row[1],
-                    "type": row[2],
-                    "season": row[3],
-                    "library": row[4],
-                    "timestamp": row[5]
-                })
-            
-            logger.debug(f"[PG] Retrieved {len(results)} total requests")
-            return results
-        except Exception as e:
-            logger.error(f"Failed to get all requests from Postgres: {e}")
-    
-    # Fallback to JSON
-    logs = _load_json(REQUESTS_LOG_FILE, [])
-    return logs[-limit:] if limit else logs
+            conn.rollback()
+        except Exception:
+            pass
+
+
+def get_stats_aggregates(top_n: int = 5) -> Optional[Dict]:
+    """
+    Compute the /stats aggregates in Postgres with GROUP BY instead of
+    pulling every row into Python. Returns None when Postgres is off so
+    callers can fall back to scanning the JSON log.
+    """
+    with _pg_conn() as conn:
+        if conn:
+            try:
+                _ensure_stats_indexes(conn)
+                table = f"{POSTGRES_SCHEMA}.telegram_requests"
+                cursor = conn.cursor()
+
+                cursor.execute(
+                    f"""
+                    SELECT COUNT(*),
+                           COUNT(DISTINCT user_name),
+                           COUNT(*) FILTER (WHERE media_type = 'movie'),
+                           COUNT(*) FILTER (WHERE media_type = 'tv'),
+                           COUNT(*) FILTER (WHERE requested_at >= NOW() - INTERVAL '7 days')
+                    FROM {table}
+                    """
+                )
+                total, unique_users, movie_count, tv_count, recent_count = cursor.fetchone()
+
+                def _top(column):
+                    cursor.execute(
+                        f"SELECT {column}, COUNT(*) AS c FROM {table} "
+                        f"GROUP BY {column} ORDER BY c DESC LIMIT %s",
+                        (top_n,)
+                    )
+                    return [(name or "Unknown", count) for name, count in cursor.fetchall()]
+
+                top_users = _top("user_name")
+                top_libraries = _top("library_name")
+                top_titles = _top("title")
+                cursor.close()
+
+                return {
+                    "total": total,
+                    "unique_users": unique_users,
+                    "movie_count": movie_count,
+                    "tv_count": tv_count,
+                    "recent_count": recent_count,
+                    "top_users": top_users,
+                    "top_libraries": top_libraries,
+                    "top_titles": top_titles,
+                }
+            except Exception as e:
+                logger.exception(f"Failed to compute stats in Postgres: {e}")
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
+    return None
 
 
 # ============================================================================
 # Availability Watchlist
 # ============================================================================
 
+# In-memory index of the watchlist keyed by (media_id, media_type, season),
+# so membership checks and removals are O(1) hash lookups instead of list
+# scans. Serialized back to disk as list(values()) — the file format is
+# unchanged.
+_watchlist_cache: Optional[Dict[tuple, Dict]] = None
+
+# Monotonic version bumped on every mutation; per-chat filtered lists are
+# memoized against it so repeat /pending hits skip the filter entirely.
+_watchlist_version = 0
+_watchlist_by_chat: Dict[int, tuple] = {}  # chat_id -> (version, rows)
+
+
+def _load_watchlist() -> Dict[tuple, Dict]:
+    """Materialize (once) the keyed watchlist cache from disk."""
+    global _watchlist_cache
+    if _watchlist_cache is None:
+        entries = _store.get_or_load(AVAILABILITY_WATCH_FILE, [])
+        _watchlist_cache = {
+            (w.get("media_id"), w.get("media_type"), w.get("season")): w
+            for w in entries
+        }
+    return _watchlist_cache
+
+
+def _mark_watchlist_dirty():
+    global _watchlist_version
+    _watchlist_version += 1
+    _watchlist_by_chat.clear()
+    _store.mark_dirty(AVAILABILITY_WATCH_FILE, list(_load_watchlist().values()))
+
+
 def add_to_watchlist(
     media_id: int,
     media_type: str,
     chat_id: int,
     title: str,
     library_name: str = None,
-    season: int = None
+    season: int = None,
+    tvdb_id: int = None
 ) -> bool:
     """Add an item to the availability watchlist."""
-    watchlist = _load_json(AVAILABILITY_WATCH_FILE, [])
-    
-    # Check if already exists
-    exists = any(
-        (w.get("media_id") == media_id and
-         w.get("media_type") == media_type and
-         w.get("season") == season)
-        for w in watchlist
-    )
-    
-    if exists:
+    cache = _load_watchlist()
+    key = (media_id, media_type, season)
+
+    if key in cache:
         logger.debug(f"Item already in watchlist: {title}")
         return True
-    
-    entry = {
+
+    cache[key] = {
         "media_id": media_id,
         "media_type": media_type,
         "season": season,
         "chat_id": chat_id,
         "title": title,
         "library_name": library_name,
+        # Stable per show; caching it saves a get_details call per sweep
+        "tvdb_id": tvdb_id,
         "added_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "last_known_status": None,
     }
-    
-    watchlist.append(entry)
-    success = _save_json(AVAILABILITY_WATCH_FILE, watchlist)
-    
-    if success:
-        logger.info(f"Added to watchlist: {title}")
-    return success
+    _mark_watchlist_dirty()
+
+    logger.info(f"Added to watchlist: {title}")
+    return True
+
 
+def get_watchlist(chat_id: int = None) -> List[Dict]:
+    """Get watchlist items, optionally filtered to a single chat."""
+    entries = _load_watchlist().values()
+    if chat_id is None:
+        return list(entries)
 
-def get_watchlist() -> List[Dict]:
-    """Get all items in the watchlist."""
-    return _load_json(AVAILABILITY_WATCH_FILE, [])
+    cached = _watchlist_by_chat.get(chat_id)
+    if cached is not None and cached[0] == _watchlist_version:
+        return cached[1]
+
+    rows = [w for w in entries if w.get("chat_id") == chat_id]
+    _watchlist_by_chat[chat_id] = (_watchlist_version, rows)
+    return rows
+
+
+def set_confirmation_message_id(media_id: int, media_type: str, season: int = None,
+                                chat_id: int = None, message_id: int = None) -> bool:
+    """
+    Patch one watchlist entry's confirmation_message_id by composite key —
+    an O(1) cache update instead of scanning and rewriting the whole list.
+    """
+    entry = _load_watchlist().get((media_id, media_type, season))
+    if entry is None or (chat_id is not None and entry.get("chat_id") != chat_id):
+        return False
+    entry["confirmation_message_id"] = message_id
+    _mark_watchlist_dirty()
+    return True
 
 
 def update_watchlist(watchlist: List[Dict]) -> bool:
     """Update the entire watchlist (used by availability checker)."""
-    return _save_json(AVAILABILITY_WATCH_FILE, watchlist)
+    global _watchlist_cache
+    _watchlist_cache = {
+        (w.get("media_id"), w.get("media_type"), w.get("season")): w
+        for w in watchlist
+    }
+    _mark_watchlist_dirty()
+    return True
 
 
 def remove_from_watchlist(media_id: int, media_type: str, season: int = None) -> bool:
     """Remove a specific item from watchlist."""
-    watchlist = _load_json(AVAILABILITY_WATCH_FILE, [])
-    
-    original_len = len(watchlist)
-    watchlist = [
-        w for w in watchlist
-        if not (w.get("media_id") == media_id and
-                w.get("media_type") == media_type and
-                w.get("season") == season)
-    ]
-    
-    if len(watchlist) < original_len:
-        success = _save_json(AVAILABILITY_WATCH_FILE, watchlist)
-        if success:
-            logger.info(f"Removed from watchlist: {media_id} ({media_type})")
-        return success
-    
+    cache = _load_watchlist()
+
+    if cache.pop((media_id, media_type, season), None) is not None:
+        _mark_watchlist_dirty()
+        logger.info(f"Removed from watchlist: {media_id} ({media_type})")
+        return True
+
     return False
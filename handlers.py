@@ -2,38 +2,210 @@
 """
 All Telegram command and callback handlers for the Overseerr bot.
 """
+import asyncio
 import logging
 import os
-import uuid
+import time
 from typing import Any, Dict, List, Optional
 from datetime import datetime
-from collections import Counter
+from collections import Counter, deque
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram import InlineQueryResultArticle, InputTextMessageContent, InlineQueryResultPhoto
 from telegram.ext import ContextTypes
 
 import requests
-
-from overseerr_api import search_media, get_details, request_media
-from config import LIBRARIES_MOVIES, LIBRARIES_TV, TMDB_API_KEY
-from database import log_request, get_user_requests, get_all_requests, add_to_watchlist, remove_from_watchlist
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from overseerr_api import search_media, get_details, request_media, ttl_cache
+from config import LIBRARIES_MOVIES, LIBRARIES_TV, TMDB_API_KEY, OVERSEERR_API_URL, OVERSEERR_API_KEY
+from database import (
+    log_request_async, get_user_requests, get_user_request_by_id,
+    iter_all_requests, get_stats_aggregates,
+    add_to_watchlist, remove_from_watchlist
+)
 from utils import (
     safe_year, title_with_year_from_details, is_available,
-    imdb_url_from_details, get_tmdb_details_or_none, tmdb_search
+    imdb_url_from_details, get_tmdb_details_or_none, tmdb_search,
+    normalize_item
 )
 
 # Aliases for backward compatibility
 MOVIE_LIBRARIES = LIBRARIES_MOVIES
 TV_LIBRARIES = LIBRARIES_TV
 
+# Reverse id→name maps built once at import, replacing the per-click linear
+# scans over the forward maps
+MOVIE_LIBRARIES_BY_ID = {v: k for k, v in MOVIE_LIBRARIES.items()}
+TV_LIBRARIES_BY_ID = {v: k for k, v in TV_LIBRARIES.items()}
+
 logger = logging.getLogger(__name__)
 
+# Whether the installed python-telegram-bot accepts our InlineQueryResultPhoto
+# kwargs is a property of the library version, not of each result — probe the
+# constructor once here instead of catching TypeError per inline result.
+try:
+    InlineQueryResultPhoto(
+        id="probe",
+        photo_url="https://example.invalid/p.jpg",
+        thumb_url="https://example.invalid/p.jpg",
+        title="probe",
+        input_message_content=InputTextMessageContent("probe"),
+    )
+    _PHOTO_RESULTS_OK = True
+except TypeError:
+    _PHOTO_RESULTS_OK = False
+
+# Markdown (v1) escape table: one C-level translate pass instead of a chain
+# of .replace() calls that each rescan the string.
+_MD_ESCAPE = str.maketrans({'_': '\\_', '*': '\\*', '[': '\\[', '`': '\\`'})
+
+# Shared session for the HTTP calls made directly from this module
+# (recommendations, TMDB fallback search): keep-alive connections plus a
+# small retry budget instead of a TCP+TLS handshake per call.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "overseerr-telegram-bot"
+_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504)),
+)
+_SESSION.mount("https://", _adapter)
+_SESSION.mount("http://", _adapter)
+del _adapter
+
+# Circuit breaker for Overseerr searches: after a few consecutive failures
+# (slow/down server, each keystroke otherwise eats two timeouts) the breaker
+# opens and inline search goes straight to TMDB for a cooldown period.
+_OVERSEERR_BREAKER = {"fails": 0, "open_until": 0.0}
+_BREAKER_THRESHOLD = 3
+_BREAKER_COOLDOWN = 30.0
+
+
+def _breaker_record(ok: bool):
+    """Track an Overseerr call outcome; open the breaker after repeated failures."""
+    if ok:
+        _OVERSEERR_BREAKER["fails"] = 0
+        return
+    _OVERSEERR_BREAKER["fails"] += 1
+    if _OVERSEERR_BREAKER["fails"] >= _BREAKER_THRESHOLD:
+        _OVERSEERR_BREAKER["open_until"] = time.monotonic() + _BREAKER_COOLDOWN
+        _OVERSEERR_BREAKER["fails"] = 0
+        logger.warning("Overseerr looks unhealthy; skipping it for %.0fs", _BREAKER_COOLDOWN)
+
+
+# Single-flight coalescing: when many users trigger the same Overseerr
+# lookup within a few seconds (popular titles), the second-through-Nth
+# caller awaits the first in-flight call instead of issuing its own.
+_inflight: Dict[tuple, "asyncio.Future"] = {}
+
+
+async def _single_flight(key: tuple, fn, *args):
+    """Run blocking `fn(*args)` in a thread, coalescing concurrent callers by key."""
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await fut
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await asyncio.to_thread(fn, *args)
+        fut.set_result(result)
+        return result
+    except BaseException as e:
+        fut.set_exception(e)
+        fut.exception()  # mark retrieved in case nobody else is waiting
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+
+async def get_details_async(media_id, media_type: str):
+    """get_details with concurrent identical calls coalesced."""
+    return await _single_flight(("details", media_type, media_id), get_details, media_id, media_type)
+
+
+async def search_media_async(query: str, media_type: str):
+    """search_media with concurrent identical calls coalesced."""
+    return await _single_flight(("search", media_type, query), search_media, query, media_type)
+
+
+async def get_recommendations_async(media_id, media_type: str, limit: int = 10):
+    """get_recommendations with concurrent identical calls coalesced."""
+    return await _single_flight(("recs", media_type, media_id, limit), get_recommendations, media_id, media_type, limit)
+
+# Overseerr status code → readable text, built once instead of per loop iteration
+_OVERSEERR_STATUS = {
+    1: "⏳ Pending Approval",
+    2: "✅ Approved",
+    3: "❌ Declined",
+    4: "🎉 Available"
+}
+_OVERSEERR_MEDIA_STATUS = {
+    1: "Unknown",
+    2: "📥 Pending",
+    3: "⚙️ Processing",
+    4: "⬇️ Partially Available",
+    5: "✅ Available"
+}
+
+# Buttons are immutable, so the Cancel instance can be shared across every
+# confirmation keyboard; only the Confirm callback_data varies per click.
+CANCEL_BUTTON = InlineKeyboardButton("❌ Cancel", callback_data="cancel")
+
+
+def confirm_row(cb_data: str) -> list:
+    """Build the standard [Confirm / Cancel] button row."""
+    return [InlineKeyboardButton("✅ Confirm", callback_data=cb_data), CANCEL_BUTTON]
+
 
 # ---------------------------------------------------------------------------
 # State & Message Tracking
 # ---------------------------------------------------------------------------
-user_context: Dict[int, Dict[str, Any]] = {}  # ephemeral per-user flow state
+# Ephemeral per-user flow state, bounded so memory stays flat no matter how
+# many users ever interact with the bot. Eviction drops the least-recently
+# active user's state; any messages still tracked for them simply stop being
+# auto-cleaned — an acceptable tradeoff versus unbounded growth. lru-dict
+# provides a C-implemented LRU; the fallback evicts oldest-inserted entries.
+_USER_CONTEXT_MAX = 10_000
+
+try:
+    from lru import LRU as _LRUDict
+    user_context = _LRUDict(_USER_CONTEXT_MAX)
+except ImportError:
+    class _BoundedDict(dict):
+        """dict that evicts its oldest entry once maxsize is reached."""
+
+        def __init__(self, maxsize: int):
+            super().__init__()
+            self._maxsize = maxsize
+
+        def __setitem__(self, key, value):
+            if key not in self and len(self) >= self._maxsize:
+                del self[next(iter(self))]
+            super().__setitem__(key, value)
+
+    _LRUDict = _BoundedDict
+    user_context = _BoundedDict(_USER_CONTEXT_MAX)
+
+# Assembled poster payloads keyed by (media_type, media_id): repeat clicks on
+# the same (often trending) title skip caption/button assembly entirely.
+_POSTER_CACHE = _LRUDict(2048)
+
+# Short-lived payloads from inline search keyed by result id, so picking an
+# inline result renders its poster from data we already fetched instead of
+# issuing a second details call.
+_INLINE_RESULT_CACHE = _LRUDict(4096)
+_INLINE_RESULT_TTL = 180
+
+
+def _invalidate_poster_cache(media_type: str, media_id):
+    """Drop the cached poster payload for one item (e.g. after a request)."""
+    try:
+        del _POSTER_CACHE[(media_type, media_id)]
+    except KeyError:
+        pass
 
 
 def track_message(user_id: int, message_id: int):
@@ -43,13 +215,41 @@ def track_message(user_id: int, message_id: int):
     user_context[user_id].setdefault("messages", []).append(message_id)
 
 
+# Global outbound throttle: the semaphore bounds in-flight bot calls and the
+# sliding one-second window keeps the send rate just under Telegram's
+# 30 msg/s bot-wide limit, so bursts back off instead of triggering 429s.
+_BOT_RPS = 25
+_bot_call_sem = asyncio.Semaphore(_BOT_RPS)
+_bot_call_times: deque = deque()
+
+
+async def _throttle_bot_call():
+    """Wait until another outbound bot call fits under the _BOT_RPS budget."""
+    while True:
+        now = time.monotonic()
+        while _bot_call_times and now - _bot_call_times[0] >= 1.0:
+            _bot_call_times.popleft()
+        if len(_bot_call_times) < _BOT_RPS:
+            _bot_call_times.append(now)
+            return
+        await asyncio.sleep(1.0 - (now - _bot_call_times[0]))
+
+
+async def _delete_one(context: ContextTypes.DEFAULT_TYPE, chat_id: int, message_id: int):
+    """Best-effort single message delete, bounded by the outbound throttle."""
+    async with _bot_call_sem:
+        await _throttle_bot_call()
+        await context.bot.delete_message(chat_id, message_id)
+
+
 async def cleanup_messages(context: ContextTypes.DEFAULT_TYPE, chat_id: int, user_id: int):
-    """Clean up tracked messages for a user."""
-    for mid in user_context.get(user_id, {}).get("messages", []):
-        try:
-            await context.bot.delete_message(chat_id, mid)
-        except Exception:
-            pass
+    """Clean up tracked messages for a user (deletions fire concurrently)."""
+    mids = user_context.get(user_id, {}).get("messages", [])
+    if mids:
+        await asyncio.gather(
+            *(_delete_one(context, chat_id, mid) for mid in mids),
+            return_exceptions=True
+        )
     if user_id in user_context:
         user_context[user_id]["messages"] = []
 
@@ -58,6 +258,7 @@ async def _delete_message_job(context: ContextTypes.DEFAULT_TYPE):
     """Job to auto-delete a message after delay."""
     data = context.job.data
     try:
+        await _throttle_bot_call()
         await context.bot.delete_message(chat_id=data["chat_id"], message_id=data["message_id"])
     except Exception:
         pass
@@ -76,36 +277,42 @@ async def schedule_autodelete(context: ContextTypes.DEFAULT_TYPE, chat_id: int,
 # ---------------------------------------------------------------------------
 # Command Handlers
 # ---------------------------------------------------------------------------
+
+# Concatenated once at import time — only {first_name} varies per /start
+_WELCOME_TEMPLATE = (
+    "👋 **Hey {first_name}!**\n\n"
+    "I'm your *Overseerr Telegram Assistant* — here to help you find, request, "
+    "and keep track of movies and TV shows from your media server.\n\n"
+    "🎬 **Here's what I can do:**\n"
+    "• `/searchmovie <title>` – Find and request movies\n"
+    "• `/searchtv <title>` – Find and request TV shows\n"
+    "• `/browse` – Browse trending movies (use `/browse tv` for shows)\n"
+    "• Tap **✅ Request** on posters to add items directly to Overseerr\n"
+    "• Tap **🔁 Recommendations** for similar titles\n"
+    "• Tap **⭐ IMDb / 📂 TMDB** links for details\n\n"
+    "📋 **Track Your Requests:**\n"
+    "• `/myrequests` – View all your requests with cancel option\n"
+    "• `/pending` – See what you're waiting for\n"
+    "• `/status` – Check download/processing status\n\n"
+    "🧠 **Smart features:**\n"
+    "• Detects if something is already in your library\n"
+    "• Sends notifications when new requests become available\n"
+    "• Shows rich movie cards with posters, genres, and ratings\n\n"
+    "Ready to start? Search for something now 👇\n"
+    "`/searchmovie Dune`\n"
+)
+
+
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Send welcome message."""
     user = update.effective_user
     first_name = user.first_name if user and user.first_name else "there"
 
-    welcome_text = (
-        f"👋 **Hey {first_name}!**\n\n"
-        "I'm your *Overseerr Telegram Assistant* — here to help you find, request, "
-        "and keep track of movies and TV shows from your media server.\n\n"
-        "🎬 **Here's what I can do:**\n"
-        "• `/searchmovie <title>` – Find and request movies\n"
-        "• `/searchtv <title>` – Find and request TV shows\n"
-        "• `/browse` – Browse trending movies (use `/browse tv` for shows)\n"
-        "• Tap **✅ Request** on posters to add items directly to Overseerr\n"
-        "• Tap **🔁 Recommendations** for similar titles\n"
-        "• Tap **⭐ IMDb / 📂 TMDB** links for details\n\n"
-        "📋 **Track Your Requests:**\n"
-        "• `/myrequests` – View all your requests with cancel option\n"
-        "• `/pending` – See what you're waiting for\n"
-        "• `/status` – Check download/processing status\n\n"
-        "🧠 **Smart features:**\n"
-        "• Detects if something is already in your library\n"
-        "• Sends notifications when new requests become available\n"
-        "• Shows rich movie cards with posters, genres, and ratings\n\n"
-        "Ready to start? Search for something now 👇\n"
-        "`/searchmovie Dune`\n"
+    await update.message.reply_text(
+        _WELCOME_TEMPLATE.format(first_name=first_name),
+        parse_mode="Markdown"
     )
 
-    await update.message.reply_text(welcome_text, parse_mode="Markdown")
-
 
 async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show enhanced bot statistics (admin only)."""
@@ -118,83 +325,89 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         return
     
     try:
-        logs = get_all_requests()
-        
-        if not logs:
+        # Prefer database-side GROUP BY aggregation: transfers O(5) rows
+        # instead of the whole request history. Off the loop — it's a
+        # blocking Postgres query.
+        agg = await asyncio.to_thread(get_stats_aggregates, top_n=5)
+        if agg:
+            total = agg["total"]
+            unique_users = agg["unique_users"]
+            movie_count = agg["movie_count"]
+            tv_count = agg["tv_count"]
+            recent_count = agg["recent_count"]
+            top_users = agg["top_users"]
+            top_libraries = agg["top_libraries"]
+            popular_titles = agg["top_titles"]
+        else:
+            # JSON fallback: single pass over the logs, updating every
+            # counter inline instead of re-scanning once per statistic.
+            # Timestamps are formatted "YYYY-MM-DD HH:MM:SS", so a plain
+            # string comparison against the cutoff replaces a
+            # datetime.strptime per row.
+            # Stream the rows instead of materializing the full history
+            total = 0
+            users = Counter()
+            libraries = Counter()
+            titles = Counter()
+            movie_count = tv_count = recent_count = 0
+            week_ago_ts = (datetime.now() - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")
+
+            for r in iter_all_requests():
+                total += 1
+                users[r.get("user", "Unknown")] += 1
+                libraries[r.get("library", "Unknown")] += 1
+                titles[r.get("title", "Unknown")] += 1
+                t = r.get("type")
+                if t == "movie":
+                    movie_count += 1
+                elif t == "tv":
+                    tv_count += 1
+                if r.get("timestamp", "") >= week_ago_ts:
+                    recent_count += 1
+
+            unique_users = len(users)
+            top_users = users.most_common(5)
+            top_libraries = libraries.most_common(5)
+            popular_titles = titles.most_common(5)
+
+        if not total:
             await update.message.reply_text("📊 No statistics available yet.")
             return
         
-        total = len(logs)
-        
-        # User statistics
-        users = Counter([r.get("user", "Unknown") for r in logs])
-        unique_users = len(users)
-        top_users = users.most_common(5)
-        
-        # Media type breakdown
-        movie_count = sum(1 for r in logs if r.get("type") == "movie")
-        tv_count = sum(1 for r in logs if r.get("type") == "tv")
-        
-        # Library statistics
-        libraries = Counter([r.get("library", "Unknown") for r in logs])
-        top_libraries = libraries.most_common(5)
-        
-        # Popular requests
-        titles = Counter([r.get("title", "Unknown") for r in logs])
-        popular_titles = titles.most_common(5)
-        
-        # Recent activity (last 7 days)
-        now = datetime.now()
-        week_ago = now - timedelta(days=7)
-        recent_requests = []
-        
-        for r in logs:
-            try:
-                timestamp_str = r.get("timestamp", "")
-                if timestamp_str:
-                    # Parse timestamp (format: "2026-01-01 12:00:00")
-                    req_time = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-                    if req_time >= week_ago:
-                        recent_requests.append(r)
-            except Exception:
-                pass
-        
-        recent_count = len(recent_requests)
-        
-        # Build message
-        message = "📊 *Bot Statistics Dashboard*\n"
-        message += "━━━━━━━━━━━━━━━━━━━━━━━\n\n"
-        
-        message += "*📈 Overview*\n"
-        message += f"• Total Requests: `{total}`\n"
-        message += f"• Unique Users: `{unique_users}`\n"
-        message += f"• Movies: `{movie_count}` ({movie_count*100//total if total else 0}%)\n"
-        message += f"• TV Shows: `{tv_count}` ({tv_count*100//total if total else 0}%)\n"
-        message += f"• Last 7 Days: `{recent_count}` requests\n\n"
-        
-        message += "*👥 Top Users*\n"
+        # Build message into a parts list, joined once at the end, instead of
+        # reallocating the growing string with every +=
+        parts = [
+            "📊 *Bot Statistics Dashboard*\n",
+            "━━━━━━━━━━━━━━━━━━━━━━━\n\n",
+            "*📈 Overview*\n",
+            f"• Total Requests: `{total}`\n",
+            f"• Unique Users: `{unique_users}`\n",
+            f"• Movies: `{movie_count}` ({movie_count*100//total if total else 0}%)\n",
+            f"• TV Shows: `{tv_count}` ({tv_count*100//total if total else 0}%)\n",
+            f"• Last 7 Days: `{recent_count}` requests\n\n",
+        ]
+
+        parts.append("*👥 Top Users*\n")
         for i, (user, count) in enumerate(top_users, 1):
             # Truncate long usernames and escape markdown special chars
             display_name = user[:30] + "..." if len(user) > 30 else user
-            # Escape markdown special characters
-            display_name = display_name.replace('_', '\\_').replace('*', '\\*').replace('[', '\\[').replace('`', '\\`')
-            message += f"{i}. {display_name}: `{count}` requests\n"
-        message += "\n"
-        
-        message += "*📚 Top Libraries*\n"
+            display_name = display_name.translate(_MD_ESCAPE)
+            parts.append(f"{i}. {display_name}: `{count}` requests\n")
+        parts.append("\n")
+
+        parts.append("*📚 Top Libraries*\n")
         for i, (lib, count) in enumerate(top_libraries, 1):
-            message += f"{i}. {lib}: `{count}` requests\n"
-        message += "\n"
-        
-        message += "*🔥 Most Requested*\n"
+            parts.append(f"{i}. {lib}: `{count}` requests\n")
+        parts.append("\n")
+
+        parts.append("*🔥 Most Requested*\n")
         for i, (title, count) in enumerate(popular_titles, 1):
             display_title = title[:35] + "..." if len(title) > 35 else title
-            # Escape markdown special characters in titles
-            display_title = display_title.replace('_', '\\_').replace('*', '\\*').replace('[', '\\[').replace('`', '\\`')
+            display_title = display_title.translate(_MD_ESCAPE)
             if count > 1:
-                message += f"{i}. {display_title} (`{count}x`)\n"
-        
-        await update.message.reply_text(message, parse_mode="Markdown")
+                parts.append(f"{i}. {display_title} (`{count}x`)\n")
+
+        await update.message.reply_text("".join(parts), parse_mode="Markdown")
         
     except Exception as e:
         logger.exception("Error generating stats")
@@ -203,51 +416,71 @@ async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 
 
-async def search_movie(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Search for movies command."""
-    track_message(update.effective_user.id, update.message.message_id)
-
-    query = " ".join(context.args)
-    if not query:
-        await update.message.reply_text("Usage: /searchmovie <movie name>")
-        return
-
-    results = search_media(query, "movie")
-    if not results:
-        await update.message.reply_text("No movies found.")
-        return
-
-    keyboard = []
+def _render_media_list(results, media_type: str, max_results: int = 5, max_overview: int = 100):
+    """
+    Format search/discover results into message lines and selection buttons.
+    Shared by /searchmovie, /searchtv and /browse so the render block lives
+    in exactly one place. Returns (lines, keyboard).
+    """
     lines = []
-    for r in results[:5]:
-        year = safe_year(r.get("releaseDate") or r.get("release_date"))
+    keyboard = []
+    callback_prefix = "movie" if media_type == "movie" else "tv"
+
+    for r in results[:max_results]:
+        # Bind locals once per row rather than re-doing dict lookups below
+        title = r.get("title", "Unknown")
+        rid = r["id"]
+        year = safe_year(
+            r.get("releaseDate") or r.get("release_date")
+            or r.get("firstAirDate") or r.get("first_air_date")
+        )
         rating = r.get("voteAverage")
         overview = r.get("overview", "")
-        
+
         # Format rating
         rating_str = f"⭐️ {rating:.1f}" if rating else ""
-        
+
         # Title with year
-        title_line = f"*{r.get('title', 'Unknown')}*" + (f" ({year})" if year else "")
-        
+        title_line = f"*{title}*" + (f" ({year})" if year else "")
+
         # Build result line
         result_parts = [title_line]
         if rating_str:
             result_parts.append(rating_str)
-        
-        # Truncate overview to fit
+
+        # Truncate overview to fit; rfind locates the last space in one
+        # C-level scan without the substring/list allocations of rsplit
         if overview:
-            max_overview_length = 100
-            if len(overview) > max_overview_length:
-                overview = overview[:max_overview_length].rsplit(' ', 1)[0] + "..."
+            if len(overview) > max_overview:
+                cut = overview.rfind(' ', 0, max_overview)
+                overview = overview[:cut if cut > 0 else max_overview] + "..."
             result_parts.append(f"_{overview}_")
-        
+
         lines.append(" ".join(result_parts) if len(result_parts) == 1 else "\n".join(result_parts))
         lines.append("")  # Empty line between results
-        
+
         # Button label
-        button_label = f"{r.get('title', 'Unknown')}" + (f" ({year})" if year else "")
-        keyboard.append([InlineKeyboardButton(button_label, callback_data=f"movie:{r['id']}")])
+        button_label = title + (f" ({year})" if year else "")
+        keyboard.append([InlineKeyboardButton(button_label, callback_data=f"{callback_prefix}:{rid}")])
+
+    return lines, keyboard
+
+
+async def search_movie(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Search for movies command."""
+    track_message(update.effective_user.id, update.message.message_id)
+
+    query = " ".join(context.args)
+    if not query:
+        await update.message.reply_text("Usage: /searchmovie <movie name>")
+        return
+
+    results = await search_media_async(query, "movie")
+    if not results:
+        await update.message.reply_text("No movies found.")
+        return
+
+    lines, keyboard = _render_media_list(results, "movie")
 
     sent_text = await update.message.reply_text(
         "🎬 *Search Results:*\n\n" + "\n".join(lines),
@@ -271,42 +504,12 @@ async def search_tv(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("Usage: /searchtv <tv show name>")
         return
 
-    results = search_media(query, "tv")
+    results = await search_media_async(query, "tv")
     if not results:
         await update.message.reply_text("No TV shows found.")
         return
 
-    keyboard = []
-    lines = []
-    for r in results[:5]:
-        year = safe_year(r.get("firstAirDate") or r.get("first_air_date"))
-        rating = r.get("voteAverage")
-        overview = r.get("overview", "")
-        
-        # Format rating
-        rating_str = f"⭐️ {rating:.1f}" if rating else ""
-        
-        # Title with year
-        title_line = f"*{r.get('title', 'Unknown')}*" + (f" ({year})" if year else "")
-        
-        # Build result line
-        result_parts = [title_line]
-        if rating_str:
-            result_parts.append(rating_str)
-        
-        # Truncate overview to fit
-        if overview:
-            max_overview_length = 100
-            if len(overview) > max_overview_length:
-                overview = overview[:max_overview_length].rsplit(' ', 1)[0] + "..."
-            result_parts.append(f"_{overview}_")
-        
-        lines.append(" ".join(result_parts) if len(result_parts) == 1 else "\n".join(result_parts))
-        lines.append("")  # Empty line between results
-
-        # Button label
-        button_label = f"{r.get('title', 'Unknown')}" + (f" ({year})" if year else "")
-        keyboard.append([InlineKeyboardButton(button_label, callback_data=f"tv:{r['id']}")])
+    lines, keyboard = _render_media_list(results, "tv")
 
     sent_text = await update.message.reply_text(
         "📺 *Search Results:*\n\n" + "\n".join(lines),
@@ -321,77 +524,139 @@ async def search_tv(update: Update, context: ContextTypes.DEFAULT_TYPE):
     track_message(update.effective_user.id, sent.message_id)
 
 
-async def my_requests(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Show user's recent requests with option to cancel."""
-    telegram_user = f"{update.effective_user.full_name} (@{update.effective_user.username})" \
-        if update.effective_user.username else update.effective_user.full_name
+_MY_REQUESTS_PAGE_SIZE = 10
 
-    user_requests = get_user_requests(telegram_user, limit=10)
+
+def _render_my_requests(telegram_user: str, page: int):
+    """Build the /myrequests page text and keyboard. Returns (text, markup) or None."""
+    # Fetch one extra row so we know whether a next page exists
+    user_requests = get_user_requests(
+        telegram_user,
+        limit=_MY_REQUESTS_PAGE_SIZE + 1,
+        offset=page * _MY_REQUESTS_PAGE_SIZE
+    )
 
     if not user_requests:
-        await update.message.reply_text("You have no requests recorded via Telegram.")
-        return
+        return None
+
+    has_next = len(user_requests) > _MY_REQUESTS_PAGE_SIZE
+    user_requests = user_requests[:_MY_REQUESTS_PAGE_SIZE]
 
-    # Build message with inline buttons for cancelling
     msg_lines = ["📋 Your Requests:\n"]
     kb = []
-    
-    logger.info(f"User requests data: {user_requests}")
-    
+    row_fmt = "• {title}{season_text}\n  {type} | {library} | {timestamp}".format
+
     for r in user_requests:
         req_id = r.get('id')
-        season_text = f" (Season {r.get('season')})" if r.get("season") else ""
-        msg_lines.append(f"• {r.get('title')}{season_text}")
-        msg_lines.append(f"  {r.get('type').upper()} | {r.get('library')} | {r.get('timestamp')}")
-        
+        title = r.get('title')
+        season = r.get('season')
+        msg_lines.append(row_fmt(
+            title=title,
+            season_text=f" (Season {season})" if season else "",
+            type=r.get('type').upper(),
+            library=r.get('library'),
+            timestamp=r.get('timestamp'),
+        ))
+
         # Add cancel button for each request
-        logger.info(f"Request ID for '{r.get('title')}': {req_id}")
         if req_id:
             kb.append([InlineKeyboardButton(
-                f"🗑 Cancel: {r.get('title')[:30]}",
+                f"🗑 Cancel: {title[:30]}",
                 callback_data=f"delreq:{req_id}"
             )])
-    
+
+    nav_row = []
+    if page > 0:
+        nav_row.append(InlineKeyboardButton("⬅️ Prev", callback_data=f"myreq:{page - 1}"))
+    if has_next:
+        nav_row.append(InlineKeyboardButton("Next ➡️", callback_data=f"myreq:{page + 1}"))
+    if nav_row:
+        kb.append(nav_row)
+        msg_lines.append(f"\n📄 Page {page + 1}")
+
     msg_lines.append("\n💡 Click a button below to cancel a request")
-    
-    await update.message.reply_text(
-        "\n".join(msg_lines),
-        reply_markup=InlineKeyboardMarkup(kb) if kb else None
-    )
+
+    return "\n".join(msg_lines), InlineKeyboardMarkup(kb) if kb else None
+
+
+async def my_requests(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show user's recent requests with option to cancel. Usage: /myrequests [page]"""
+    telegram_user = f"{update.effective_user.full_name} (@{update.effective_user.username})" \
+        if update.effective_user.username else update.effective_user.full_name
+
+    page = 0
+    if context.args:
+        try:
+            page = max(int(context.args[0]) - 1, 0)
+        except ValueError:
+            pass
+
+    # Postgres read — keep it off the event loop
+    rendered = await asyncio.to_thread(_render_my_requests, telegram_user, page)
+    if rendered is None:
+        await update.message.reply_text("You have no requests recorded via Telegram.")
+        return
+
+    text, markup = rendered
+    await update.message.reply_text(text, reply_markup=markup)
+
+
+async def myrequests_page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Handle next/prev pagination buttons on /myrequests (myreq: callbacks)."""
+    query = update.callback_query
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
+
+    try:
+        page = max(int(query.data.split(":")[1]), 0)
+    except Exception:
+        return
+
+    telegram_user = f"{query.from_user.full_name} (@{query.from_user.username})" \
+        if query.from_user.username else query.from_user.full_name
+
+    rendered = await asyncio.to_thread(_render_my_requests, telegram_user, page)
+    if rendered is None:
+        await query.edit_message_text("You have no requests recorded via Telegram.")
+        return
+
+    text, markup = rendered
+    await query.edit_message_text(text, reply_markup=markup)
 
 
 async def pending_requests(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Show user's pending requests that haven't become available yet."""
     from database import get_watchlist
     
-    watchlist = get_watchlist()
     chat_id = update.message.chat_id
-    
-    # Filter watchlist to this chat
-    user_pending = [w for w in watchlist if w.get("chat_id") == chat_id]
-    
+
+    # Filter happens in the database layer rather than in Python
+    user_pending = get_watchlist(chat_id=chat_id)
+
     if not user_pending:
         await update.message.reply_text("🎉 You have no pending requests! Everything you've requested is either available or not being tracked.")
         return
     
-    msg_lines = ["⏳ *Your Pending Requests:*\n"]
-    for w in user_pending:
-        title = w.get("title", "Unknown")
-        media_type = w.get("media_type", "")
-        season = w.get("season")
-        library = w.get("library_name", "")
-        
-        emoji = "🎬" if media_type == "movie" else "📺"
-        season_text = f" (Season {season})" if season else ""
-        
-        msg_lines.append(f"{emoji} *{title}*{season_text}")
-        msg_lines.append(f"   Library: {library}")
-        msg_lines.append("")
-    
-    msg_lines.append("💡 You'll be notified when these become available!")
-    
+    # One prebound row template + a single join instead of three appends
+    # (each with its own f-string) per row
+    row_fmt = "{emoji} *{title}*{season_text}\n   Library: {library}\n".format
+    body = "\n".join(
+        row_fmt(
+            emoji="🎬" if w.get("media_type", "") == "movie" else "📺",
+            title=w.get("title", "Unknown"),
+            season_text=f" (Season {w.get('season')})" if w.get("season") else "",
+            library=w.get("library_name", ""),
+        )
+        for w in user_pending
+    )
+
     await update.message.reply_text(
-        "\n".join(msg_lines),
+        "".join([
+            "⏳ *Your Pending Requests:*\n\n",
+            body,
+            "\n💡 You'll be notified when these become available!"
+        ]),
         parse_mode="Markdown"
     )
 
@@ -404,50 +669,45 @@ async def request_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
     telegram_user = f"{update.effective_user.full_name} (@{update.effective_user.username})" \
         if update.effective_user.username else update.effective_user.full_name
 
-    user_requests = get_user_requests(telegram_user, limit=10)
+    user_requests = await asyncio.to_thread(get_user_requests, telegram_user, limit=10)
 
     if not user_requests:
         await update.message.reply_text("You have no requests recorded.")
         return
     
     msg_lines = ["📊 *Request Status Updates:*\n"]
-    
+
+    # Fan out all Overseerr status lookups concurrently instead of paying
+    # one round-trip per request sequentially.
+    ids = [r.get('overseerr_request_id') for r in user_requests]
+    status_results = await asyncio.gather(
+        *(asyncio.to_thread(get_request_status, i) for i in ids if i),
+        return_exceptions=True
+    )
+    status_by_id = {i: res for i, res in zip((i for i in ids if i), status_results)}
+
     for r in user_requests:
         overseerr_req_id = r.get('overseerr_request_id')
         title = r.get('title', 'Unknown')
         season_text = f" (Season {r.get('season')})" if r.get("season") else ""
-        
+
         if not overseerr_req_id:
             msg_lines.append(f"• *{title}*{season_text}")
             msg_lines.append(f"  ⚠️ No Overseerr ID - cannot check status")
             msg_lines.append("")
             continue
-        
+
         try:
-            status_data = get_request_status(overseerr_req_id)
+            status_data = status_by_id.get(overseerr_req_id)
+            if isinstance(status_data, BaseException):
+                raise status_data
             status = status_data.get("status", "unknown")
-            
-            # Map status codes to readable text
-            status_map = {
-                1: "⏳ Pending Approval",
-                2: "✅ Approved",
-                3: "❌ Declined",
-                4: "🎉 Available"
-            }
-            status_text = status_map.get(status, f"Status: {status}")
-            
+            status_text = _OVERSEERR_STATUS.get(status, f"Status: {status}")
+
             # Check media status
             media_info = status_data.get("media", {})
             media_status = media_info.get("status", "unknown")
-            
-            media_status_map = {
-                1: "Unknown",
-                2: "📥 Pending",
-                3: "⚙️ Processing",
-                4: "⬇️ Partially Available",
-                5: "✅ Available"
-            }
-            media_text = media_status_map.get(media_status, f"Media: {media_status}")
+            media_text = _OVERSEERR_MEDIA_STATUS.get(media_status, f"Media: {media_status}")
             
             msg_lines.append(f"• *{title}*{season_text}")
             msg_lines.append(f"  {status_text}")
@@ -455,7 +715,7 @@ async def request_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
             msg_lines.append("")
             
         except Exception as e:
-            logger.exception(f"Failed to get status for request {overseerr_req_id}")
+            logger.exception("Failed to get status for request %s", overseerr_req_id)
             msg_lines.append(f"• *{title}*{season_text}")
             msg_lines.append(f"  ⚠️ Could not fetch status")
             msg_lines.append("")
@@ -477,7 +737,7 @@ async def browse_popular(update: Update, context: ContextTypes.DEFAULT_TYPE):
         media_type = "tv"
     
     try:
-        results = get_discover_content(media_type=media_type, page=1)
+        results = await asyncio.to_thread(get_discover_content, media_type=media_type, page=1)
     except Exception as e:
         logger.exception("Failed to get discover content")
         await update.message.reply_text(f"❌ Failed to fetch trending content: {str(e)}")
@@ -487,43 +747,12 @@ async def browse_popular(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text("No trending content found.")
         return
     
-    keyboard = []
-    lines = []
-    
     emoji = "🎬" if media_type == "movie" else "📺"
-    lines.append(f"*{emoji} Trending {'Movies' if media_type == 'movie' else 'TV Shows'}:*\n")
-    
-    for r in results[:10]:
-        year = safe_year(r.get("releaseDate") or r.get("firstAirDate"))
-        rating = r.get("voteAverage")
-        overview = r.get("overview", "")
-        
-        # Format rating
-        rating_str = f"⭐️ {rating:.1f}" if rating else ""
-        
-        # Title with year
-        title_line = f"*{r.get('title', 'Unknown')}*" + (f" ({year})" if year else "")
-        
-        # Build result line
-        result_parts = [title_line]
-        if rating_str:
-            result_parts.append(rating_str)
-        
-        # Truncate overview to fit
-        if overview:
-            max_overview_length = 100
-            if len(overview) > max_overview_length:
-                overview = overview[:max_overview_length].rsplit(' ', 1)[0] + "..."
-            result_parts.append(f"_{overview}_")
-        
-        lines.append(" ".join(result_parts) if len(result_parts) == 1 else "\n".join(result_parts))
-        lines.append("")  # Empty line between results
-        
-        # Button label
-        button_label = f"{r.get('title', 'Unknown')}" + (f" ({year})" if year else "")
-        callback_type = "movie" if media_type == "movie" else "tv"
-        keyboard.append([InlineKeyboardButton(button_label, callback_data=f"{callback_type}:{r['id']}")])
-    
+    header = f"*{emoji} Trending {'Movies' if media_type == 'movie' else 'TV Shows'}:*\n"
+
+    body_lines, keyboard = _render_media_list(results, media_type, max_results=10)
+    lines = [header] + body_lines
+
     lines.append(f"\n💡 Tip: Use `/browse {'tv' if media_type == 'movie' else 'movie'}` to see the other type")
     
     await update.message.reply_text(
@@ -612,7 +841,9 @@ async def restore_database_command(update: Update, context: ContextTypes.DEFAULT
 async def delete_request_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle request deletion."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("delreq:"):
@@ -627,59 +858,118 @@ async def delete_request_handler(update: Update, context: ContextTypes.DEFAULT_T
     telegram_user = f"{query.from_user.full_name} (@{query.from_user.username})" \
         if query.from_user.username else query.from_user.full_name
 
-    # Get request details
-    user_requests = get_user_requests(telegram_user, limit=100)
-    request_to_delete = next((r for r in user_requests if r.get('id') == req_id), None)
-    
+    # Single-row lookup scoped to the user instead of fetching 100 rows
+    request_to_delete = await asyncio.to_thread(get_user_request_by_id, telegram_user, req_id)
+
     if not request_to_delete:
         await query.edit_message_text("❌ Request not found or doesn't belong to you.")
         return
 
     title = request_to_delete.get('title')
-    overseerr_request_id = request_to_delete.get('overseerr_request_id')
-    
+
+    # Answer immediately, then do the slow Overseerr delete off-path via the
+    # job queue so the button press never stalls on an upstream round-trip
+    await query.edit_message_text(f"⏳ Cancelling: *{title}*…", parse_mode="Markdown")
+    context.job_queue.run_once(
+        _perform_request_delete_job,
+        when=0,
+        data={
+            "overseerr_request_id": request_to_delete.get('overseerr_request_id'),
+            "media_id": request_to_delete.get('tmdb_id'),
+            "media_type": request_to_delete.get('type'),
+            "season": request_to_delete.get('season'),
+            "chat_id": query.message.chat_id,
+            "message_id": query.message.message_id,
+            "title": title,
+        },
+        name=f"delreq:{req_id}"
+    )
+
+
+async def _perform_request_delete_job(context: ContextTypes.DEFAULT_TYPE):
+    """Job that deletes a request from Overseerr and reports the final state."""
+    data = context.job.data
+    title = data["title"]
+    overseerr_request_id = data["overseerr_request_id"]
+
     # Try to delete from Overseerr
     deleted_from_overseerr = False
     if overseerr_request_id:
         try:
             from overseerr_api import delete_request
-            delete_request(overseerr_request_id)
+            await asyncio.to_thread(delete_request, overseerr_request_id)
             deleted_from_overseerr = True
-            logger.info(f"Deleted Overseerr request {overseerr_request_id} for {title}")
+            logger.info("Deleted Overseerr request %s for %s", overseerr_request_id, title)
         except Exception as e:
-            logger.warning(f"Could not delete from Overseerr: {e}")
+            logger.warning("Could not delete from Overseerr: %s", e)
 
     # Remove from watchlist
-    media_id = request_to_delete.get('tmdb_id')
-    media_type = request_to_delete.get('type')
-    season = request_to_delete.get('season')
+    media_id = data["media_id"]
+    media_type = data["media_type"]
     if media_id and media_type:
         try:
-            remove_from_watchlist(media_id, media_type, season=season)
+            remove_from_watchlist(media_id, media_type, season=data["season"])
+            _invalidate_poster_cache(media_type, media_id)
         except Exception as e:
-            logger.warning(f"Could not remove from watchlist: {e}")
+            logger.warning("Could not remove from watchlist: %s", e)
 
-    # Send success message
+    # Replace the "Cancelling…" placeholder with the final state
     if deleted_from_overseerr:
-        await query.edit_message_text(
+        text = (
             f"✅ Successfully cancelled: *{title}*\n\n"
-            f"The request has been removed from Overseerr and Radarr/Sonarr.",
-            parse_mode="Markdown"
+            f"The request has been removed from Overseerr and Radarr/Sonarr."
         )
     else:
-        await query.edit_message_text(
+        text = (
             f"⚠️ Stopped tracking: *{title}*\n\n"
             f"Could not remove from Overseerr (request may have already been processed), "
-            f"but you'll no longer receive notifications.",
+            f"but you'll no longer receive notifications."
+        )
+    try:
+        await context.bot.edit_message_text(
+            text,
+            chat_id=data["chat_id"],
+            message_id=data["message_id"],
             parse_mode="Markdown"
         )
+    except Exception:
+        logger.exception("Failed to report request cancellation for %s", title)
+
+
 
+# Negative cache of recent Overseerr failures per item: during an outage,
+# repeat clicks go straight to the TMDB fallback instead of re-paying a
+# doomed Overseerr round-trip (with retries) first.
+_OVERSEERR_FAIL = _LRUDict(1024)
+_OVERSEERR_FAIL_TTL = 30  # seconds
+
+
+async def _tmdb_fallback_poster(query, media_type: str, media_id, context) -> bool:
+    """Try rendering the poster from TMDB; returns True when one was sent."""
+    if not TMDB_API_KEY:
+        return False
+    try:
+        tmdb_details = await asyncio.to_thread(get_tmdb_details_or_none, media_id, media_type)
+        if tmdb_details:
+            await send_rich_poster(
+                query.message.chat_id,
+                tmdb_details,
+                media_type,
+                context,
+                user_id=query.from_user.id
+            )
+            return True
+    except Exception:
+        pass
+    return False
 
 
 async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle media selection buttons (movie: or tv: callbacks)."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data:
@@ -696,12 +986,28 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception:
         pass
 
+    fail_key = (media_type, media_id)
+    failed_at = _OVERSEERR_FAIL.get(fail_key)
+    if failed_at is not None and time.monotonic() - failed_at < _OVERSEERR_FAIL_TTL:
+        # Overseerr failed for this item moments ago; skip straight to TMDB
+        if await _tmdb_fallback_poster(query, media_type, media_id, context):
+            return
+        await query.edit_message_text(
+            "Sorry - I couldn't fetch details from Overseerr for that item. Try again later."
+        )
+        return
+
     try:
-        details = get_details(media_id, media_type)
+        details = await get_details_async(media_id, media_type)
         if not details:
             await query.edit_message_text("Could not fetch details from Overseerr.")
             return
 
+        try:
+            del _OVERSEERR_FAIL[fail_key]
+        except KeyError:
+            pass
+
         await send_rich_poster(
             query.message.chat_id,
             details,
@@ -712,20 +1018,9 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     except requests.exceptions.HTTPError as he:
         logger.exception("button_handler: Overseerr error for id=%s type=%s", media_id, media_type)
-        if TMDB_API_KEY:
-            try:
-                tmdb_details = get_tmdb_details_or_none(media_id, media_type)
-                if tmdb_details:
-                    await send_rich_poster(
-                        query.message.chat_id,
-                        tmdb_details,
-                        media_type,
-                        context,
-                        user_id=query.from_user.id
-                    )
-                    return
-            except Exception:
-                pass
+        _OVERSEERR_FAIL[fail_key] = time.monotonic()
+        if await _tmdb_fallback_poster(query, media_type, media_id, context):
+            return
 
         await query.edit_message_text(
             "Sorry - I couldn't fetch details from Overseerr for that item. Try again later."
@@ -738,6 +1033,13 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def send_rich_poster(chat_id: int, details: dict, media_type: str, context: ContextTypes.DEFAULT_TYPE, user_id: Optional[int] = None):
     """Send a rich poster message with inline buttons."""
+    cache_key = (media_type, details.get("id") or details.get("tmdbId"))
+    cached = _POSTER_CACHE.get(cache_key) if cache_key[1] else None
+    if cached:
+        title, overview, caption, poster_url, kb = cached
+        await _send_poster_message(chat_id, title, overview, caption, poster_url, kb, context, user_id)
+        return
+
     title = details.get("title") or details.get("name") or "Unknown"
     year = safe_year(details.get("releaseDate") or details.get("release_date") or details.get("firstAirDate") or details.get("first_air_date"))
     tagline = details.get("tagline") or ""
@@ -797,21 +1099,33 @@ async def send_rich_poster(chat_id: int, details: dict, media_type: str, context
             tmdb_url = f"https://www.themoviedb.org/tv/{tmdb_id}"
         kb.append([InlineKeyboardButton("📂 TMDB", url=tmdb_url)])
 
-    # Trailer
-    trailer_url = None
+    # Trailer — first YouTube trailer/teaser, via a short-circuiting generator
     videos = details.get("videos") or details.get("video") or {}
-    if isinstance(videos, dict):
-        for v in videos.get("results", [])[:5]:
-            if v.get("site", "").lower() == "youtube" and v.get("type", "").lower() in ("trailer", "teaser"):
-                trailer_url = f"https://www.youtube.com/watch?v={v.get('key')}"
-                break
+    trailer_url = next(
+        (f"https://www.youtube.com/watch?v={v.get('key')}"
+         for v in (videos.get("results", [])[:5] if isinstance(videos, dict) else ())
+         if v.get("site", "").lower() == "youtube"
+         and v.get("type", "").lower() in ("trailer", "teaser")),
+        None
+    ) if videos else None
     if trailer_url:
         kb.append([InlineKeyboardButton("🎞 Watch trailer", url=trailer_url)])
 
     # Recommendations
     kb.append([InlineKeyboardButton("🔁 Recommendations", callback_data=f"recommend:{media_type}:{details.get('id')}")])
 
+    # Buttons are immutable in PTB v20+, so the assembled payload can be
+    # reused verbatim on the next click
+    if cache_key[1]:
+        _POSTER_CACHE[cache_key] = (title, overview, caption, poster_url, kb)
+
+    await _send_poster_message(chat_id, title, overview, caption, poster_url, kb, context, user_id)
+
+
+async def _send_poster_message(chat_id, title, overview, caption, poster_url, kb, context, user_id):
+    """Deliver an assembled poster payload (shared by cached and fresh paths)."""
     try:
+        await _throttle_bot_call()
         if poster_url:
             sent = await context.bot.send_photo(
                 chat_id,
@@ -849,7 +1163,9 @@ async def send_rich_poster(chat_id: int, details: dict, media_type: str, context
 async def asklib_wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle 'asklib:' callback - prompts user to select library."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("asklib:"):
@@ -899,7 +1215,9 @@ async def ask_library(query, media_type: str, media_id):
 async def library_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle library selection (lib: callback)."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("lib:"):
@@ -920,7 +1238,7 @@ async def library_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # For TV shows, ask for season selection
     if media_type == "tv":
         try:
-            details = get_details(media_id, "tv")
+            details = await get_details_async(media_id, "tv")
             seasons = details.get("seasons") or []
             if not seasons:
                 await query.edit_message_text("No seasons found for this show.")
@@ -947,22 +1265,13 @@ async def library_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         # Movies: proceed directly to confirmation
         try:
-            details = get_details(media_id, "movie")
+            details = await get_details_async(media_id, "movie")
             title = title_with_year_from_details(details, "movie")
 
-            # Find library name - MOVIE_LIBRARIES is {name: id}
-            lib_name = "Unknown"
-            for name, lid in MOVIE_LIBRARIES.items():
-                if lid == library_id:
-                    lib_name = name
-                    break
+            # Find library name via the precomputed reverse map
+            lib_name = MOVIE_LIBRARIES_BY_ID.get(library_id, "Unknown")
 
-            kb = [
-                [
-                    InlineKeyboardButton("✅ Confirm", callback_data=f"confirm:movie:{media_id}:{library_id}:0"),
-                    InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-                ]
-            ]
+            kb = [confirm_row(f"confirm:movie:{media_id}:{library_id}:0")]
 
             await query.edit_message_text(
                 f"Confirm request:\n\n*{title}*\nLibrary: {lib_name}",
@@ -979,7 +1288,9 @@ async def library_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def season_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle season selection for TV shows."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("season:"):
@@ -999,22 +1310,13 @@ async def season_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     try:
-        details = get_details(media_id, "tv")
+        details = await get_details_async(media_id, "tv")
         title = title_with_year_from_details(details, "tv")
 
-        # Find library name - TV_LIBRARIES is {name: id}
-        lib_name = "Unknown"
-        for name, lid in TV_LIBRARIES.items():
-            if lid == library_id:
-                lib_name = name
-                break
-
-        kb = [
-            [
-                InlineKeyboardButton("✅ Confirm", callback_data=f"confirm:tv:{media_id}:{library_id}:{season}"),
-                InlineKeyboardButton("❌ Cancel", callback_data="cancel")
-            ]
-        ]
+        # Find library name via the precomputed reverse map
+        lib_name = TV_LIBRARIES_BY_ID.get(library_id, "Unknown")
+
+        kb = [confirm_row(f"confirm:tv:{media_id}:{library_id}:{season}")]
 
         await query.edit_message_text(
             f"Confirm request:\n\n*{title}*\nSeason: {season}\nLibrary: {lib_name}",
@@ -1030,7 +1332,9 @@ async def season_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def confirm_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle confirmation of media request."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("confirm:"):
@@ -1053,26 +1357,35 @@ async def confirm_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if query.from_user.username else query.from_user.full_name
 
     try:
-        # Submit request to Overseerr
+        # Submit the request and fetch details concurrently — neither
+        # depends on the other, so serializing them just doubles latency
         if media_type == "movie":
-            response = request_media(media_id, "movie", library_id=library_id)
+            req_coro = asyncio.to_thread(request_media, media_id, "movie", library_id=library_id)
         else:
-            response = request_media(media_id, "tv", seasons=[season], library_id=library_id)
+            req_coro = asyncio.to_thread(request_media, media_id, "tv", seasons=[season], library_id=library_id)
+
+        response, details = await asyncio.gather(
+            req_coro,
+            get_details_async(media_id, media_type)
+        )
 
         # Extract Overseerr request ID from response
         overseerr_request_id = response.get("id")
 
-        details = get_details(media_id, media_type)
+        # The request changed the item's Overseerr state; drop the cached
+        # details so stale availability isn't served for the TTL window
+        get_details.cache_pop((media_id, media_type))
+
         title = title_with_year_from_details(details, media_type)
 
-        # Find library name - libraries are {name: id}
+        # Find library name via the precomputed reverse maps
         if media_type == "movie":
-            lib_name = next((name for name, lid in MOVIE_LIBRARIES.items() if lid == library_id), "Unknown")
+            lib_name = MOVIE_LIBRARIES_BY_ID.get(library_id, "Unknown")
         else:
-            lib_name = next((name for name, lid in TV_LIBRARIES.items() if lid == library_id), "Unknown")
+            lib_name = TV_LIBRARIES_BY_ID.get(library_id, "Unknown")
 
-        # Log to database
-        log_request(
+        # Log to database (queued; written by the background log writer)
+        await log_request_async(
             telegram_user=telegram_user,
             media_title=title,
             media_type=media_type,
@@ -1082,38 +1395,43 @@ async def confirm_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             overseerr_request_id=overseerr_request_id
         )
 
-        # Add to watchlist for availability checking
+        # Add to watchlist for availability checking.
+        # The TV details are already in hand, so cache the tvdb_id on the
+        # entry — the availability sweep then skips its per-check details fetch.
+        tvdb_id = details.get("externalIds", {}).get("tvdbId") if media_type == "tv" else None
         add_to_watchlist(
             media_id=media_id,
             media_type=media_type,
             chat_id=query.message.chat_id,
             title=title,
             library_name=lib_name,
-            season=season
+            season=season,
+            tvdb_id=tvdb_id
         )
+        _invalidate_poster_cache(media_type, media_id)
 
         # Check immediate availability from Postgres
         try:
             from postgres_checker import get_postgres_checker
             pg_checker = get_postgres_checker()
-            logger.info(f"Postgres checker status: {pg_checker is not None}")
+            logger.info("Postgres checker status: %s", pg_checker is not None)
             
             if pg_checker:
                 is_available = False
                 if media_type == "movie":
-                    logger.info(f"Checking movie availability for tmdb_id={media_id}")
-                    is_available, movie_data = pg_checker.check_movie_availability(media_id)
-                    logger.info(f"Movie availability result: is_available={is_available}, data={movie_data}")
+                    logger.info("Checking movie availability for tmdb_id=%s", media_id)
+                    is_available, movie_data = await asyncio.to_thread(pg_checker.check_movie_availability, media_id)
+                    logger.info("Movie availability result: is_available=%s, data=%s", is_available, movie_data)
                     if is_available:
                         success_msg = f"🎉 *{title}* is already available in the {lib_name} library!"
                 else:
-                    # For TV, check if it's available (season checking is complex, check show level)
-                    details_for_tvdb = get_details(media_id, "tv")
-                    tvdb_id = details_for_tvdb.get("externalIds", {}).get("tvdbId")
-                    logger.info(f"Checking TV availability for tvdb_id={tvdb_id}, season={season}")
+                    # For TV, check if it's available (season checking is complex,
+                    # check show level). The tvdb_id was already pulled from the
+                    # single details fetch above — no second get_details needed.
+                    logger.info("Checking TV availability for tvdb_id=%s, season=%s", tvdb_id, season)
                     if tvdb_id:
-                        is_available, tv_data = pg_checker.check_tv_availability(tvdb_id=tvdb_id, season_number=season)
-                        logger.info(f"TV availability result: is_available={is_available}")
+                        is_available, tv_data = await asyncio.to_thread(pg_checker.check_tv_availability, tvdb_id=tvdb_id, season_number=season)
+                        logger.info("TV availability result: is_available=%s", is_available)
                         if is_available:
                             success_msg = f"🎉 *{title}*"
                             if season:
@@ -1143,18 +1461,14 @@ async def confirm_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         # Clean up all tracked messages from the flow, but NOT the confirmation message
         await cleanup_messages(context, query.message.chat_id, query.from_user.id)
         
-        # Store confirmation message ID in watchlist so it can be deleted when available
-        # We'll update the watchlist entry we just added
+        # Store confirmation message ID in watchlist so it can be deleted when
+        # available — a keyed single-entry patch, no full-list scan/rewrite
         if not is_available:  # Only store if we're actually waiting for availability
-            from database import get_watchlist, update_watchlist
-            watchlist = get_watchlist()
-            for w in watchlist:
-                if (w.get("media_id") == media_id and 
-                    w.get("media_type") == media_type and
-                    w.get("chat_id") == query.message.chat_id):
-                    w["confirmation_message_id"] = sent.message_id
-                    break
-            update_watchlist(watchlist)
+            from database import set_confirmation_message_id
+            set_confirmation_message_id(
+                media_id, media_type, season=season,
+                chat_id=query.message.chat_id, message_id=sent.message_id
+            )
         else:
             # If already available, delete confirmation after 30 seconds
             await schedule_autodelete(context, query.message.chat_id, sent.message_id, 30)
@@ -1191,66 +1505,79 @@ async def inline_search(update: Update, context: ContextTypes.DEFAULT_TYPE):
             pass
         return
 
-    # Try Overseerr search
-    try:
-        movies = search_media(query, "movie") or []
-    except Exception as e:
-        logger.exception("search_media(movie) failed: %s", e)
-        movies = []
-
-    try:
-        tvs = search_media(query, "tv") or []
-    except Exception as e:
-        logger.exception("search_media(tv) failed: %s", e)
-        tvs = []
+    # Try Overseerr search — movie and tv lookups run concurrently so the
+    # inline answer waits for one round-trip, not two. While the breaker is
+    # open Overseerr is skipped entirely and TMDB answers directly.
+    movies, tvs = [], []
+    if time.monotonic() >= _OVERSEERR_BREAKER["open_until"]:
+        movies, tvs = await asyncio.gather(
+            search_media_async(query, "movie"),
+            search_media_async(query, "tv"),
+            return_exceptions=True
+        )
+        if isinstance(movies, BaseException):
+            logger.exception("search_media(movie) failed: %s", movies)
+            _breaker_record(False)
+            movies = []
+        else:
+            _breaker_record(True)
+        if isinstance(tvs, BaseException):
+            logger.exception("search_media(tv) failed: %s", tvs)
+            _breaker_record(False)
+            tvs = []
+        else:
+            _breaker_record(True)
 
-    items = (movies + tvs)[:8]
+    items = ((movies or []) + (tvs or []))[:8]
 
-    # Fallback to TMDB if no results
+    # Fallback to TMDB if no results; fetch both types concurrently too
     if not items and TMDB_API_KEY:
-        try:
-            items = tmdb_search(query, "movie", limit=8) or tmdb_search(query, "tv", limit=8) or []
-        except Exception:
-            items = []
+        tmdb_movies, tmdb_tvs = await asyncio.gather(
+            asyncio.to_thread(tmdb_search, query, "movie", limit=8),
+            asyncio.to_thread(tmdb_search, query, "tv", limit=8),
+            return_exceptions=True
+        )
+        if isinstance(tmdb_movies, BaseException):
+            tmdb_movies = []
+        if isinstance(tmdb_tvs, BaseException):
+            tmdb_tvs = []
+        items = (tmdb_movies or tmdb_tvs or [])[:8]
 
     results = []
-    for it in items:
+    for i, it in enumerate(items):
         media_type = it.get("media_type") or ("movie" if it.get("releaseDate") or it.get("release_date") else "tv")
         media_id = it.get("id")
-        title = it.get("title") or it.get("name") or "Unknown"
-        year = safe_year(it.get("releaseDate") or it.get("release_date") or it.get("firstAirDate") or it.get("first_air_date"))
+        title = it.get("_title", "Unknown")
+        year = safe_year(it.get("_date"))
         label = f"{title}" + (f" ({year})" if year else "")
         input_text = f"/_inlineopen {media_type} {media_id}"
 
-        poster_path = it.get("posterPath") or it.get("poster_path")
+        poster_path = it.get("_poster")
         thumb = None
         if poster_path:
             thumb = f"https://image.tmdb.org/t/p/w154{poster_path}"
 
-        rid = str(uuid.uuid4())
+        # Result ids only need to be unique within this answer batch, so a
+        # cheap counter-based id beats a uuid4() urandom read per result.
+        rid = f"{user.id if user else 0}:{i}"
         description = (it.get("overview") or "")[:120]
 
-        if thumb:
-            try:
-                results.append(
-                    InlineQueryResultPhoto(
-                        id=rid,
-                        photo_url=thumb,
-                        thumb_url=thumb,
-                        title=label,
-                        description=description,
-                        input_message_content=InputTextMessageContent(input_text),
-                    )
-                )
-            except TypeError:
-                results.append(
-                    InlineQueryResultArticle(
-                        id=rid,
-                        title=label,
-                        input_message_content=InputTextMessageContent(input_text),
-                        description=description,
-                    )
+        # Stash the search payload under the rid so a pick from these
+        # results can render its poster without re-fetching details.
+        _INLINE_RESULT_CACHE[rid] = (time.monotonic(), media_type, it)
+        input_text = f"{input_text} overseerr {rid}"
+
+        if thumb and _PHOTO_RESULTS_OK:
+            results.append(
+                InlineQueryResultPhoto(
+                    id=rid,
+                    photo_url=thumb,
+                    thumb_url=thumb,
+                    title=label,
+                    description=description,
+                    input_message_content=InputTextMessageContent(input_text),
                 )
+            )
         else:
             results.append(
                 InlineQueryResultArticle(
@@ -1280,17 +1607,32 @@ async def inlineopen_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     _, media_type, raw_id = parts[0], parts[1], parts[2]
     id_type = parts[3].lower() if len(parts) >= 4 else "overseerr"
+    rid = parts[4] if len(parts) >= 5 else None
 
     try:
         media_id = int(raw_id)
     except Exception:
         media_id = raw_id
 
+    # Fresh pick from inline search: render from the payload the search
+    # already fetched and skip the second details round-trip. Rids are
+    # per-query counters that later searches recycle (and the command text
+    # persists in chat), so only trust the entry if it matches the
+    # type/id the command itself names — otherwise fetch normally.
+    if rid is not None:
+        cached = _INLINE_RESULT_CACHE.get(rid)
+        if (cached is not None
+                and time.monotonic() - cached[0] <= _INLINE_RESULT_TTL
+                and cached[1] == media_type
+                and cached[2].get("id") == media_id):
+            await send_rich_poster(update.effective_chat.id, cached[2], cached[1], context, user_id=update.effective_user.id)
+            return
+
     # TMDB explicit
     if id_type == "tmdb":
         details = None
         try:
-            details = get_tmdb_details_or_none(media_id, media_type)
+            details = await asyncio.to_thread(get_tmdb_details_or_none, media_id, media_type)
         except Exception as e:
             logger.exception("inlineopen_handler: TMDB fallback failed: %s", e)
 
@@ -1303,7 +1645,7 @@ async def inlineopen_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     # Try Overseerr first
     try:
-        details = get_details(media_id, media_type)
+        details = await get_details_async(media_id, media_type)
         if not details:
             raise Exception("get_details returned empty")
         await send_rich_poster(update.effective_chat.id, details, media_type, context, user_id=update.effective_user.id)
@@ -1316,7 +1658,7 @@ async def inlineopen_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
     # Fallback to TMDB
     if TMDB_API_KEY:
         try:
-            tmdb_details = get_tmdb_details_or_none(media_id, media_type)
+            tmdb_details = await asyncio.to_thread(get_tmdb_details_or_none, media_id, media_type)
             if tmdb_details:
                 await send_rich_poster(update.effective_chat.id, tmdb_details, media_type, context, user_id=update.effective_user.id)
                 return
@@ -1332,7 +1674,9 @@ async def inlineopen_handler(update: Update, context: ContextTypes.DEFAULT_TYPE)
 async def recommend_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle recommendations button (recommend: callback)."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("recommend:"):
@@ -1350,7 +1694,7 @@ async def recommend_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     try:
-        recommendations = get_recommendations(media_id, media_type)
+        recommendations = await get_recommendations_async(media_id, media_type)
         if not recommendations:
             await query.edit_message_text("No recommendations found for this title.")
             return
@@ -1360,8 +1704,8 @@ async def recommend_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         lines = []
         for rec in recommendations[:5]:
             rec_id = rec.get("id")
-            rec_title = rec.get("title") or rec.get("name") or "Unknown"
-            rec_year = safe_year(rec.get("releaseDate") or rec.get("release_date") or rec.get("firstAirDate") or rec.get("first_air_date"))
+            rec_title = rec.get("_title", "Unknown")
+            rec_year = safe_year(rec.get("_date"))
             label = f"{rec_title}" + (f" ({rec_year})" if rec_year else "")
             kb.append([InlineKeyboardButton(label, callback_data=f"openrec:{media_type}:{rec_id}")])
             lines.append(label)
@@ -1379,7 +1723,9 @@ async def recommend_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def openrec_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Handle opening a recommendation (openrec: callback)."""
     query = update.callback_query
-    await query.answer()
+    # Nothing waits on the ack; fire it in the background so the real
+    # reply (edit/send) isn't serialized behind an extra round-trip.
+    context.application.create_task(query.answer())
 
     data = query.data
     if not data or not data.startswith("openrec:"):
@@ -1397,7 +1743,7 @@ async def openrec_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         pass
 
     try:
-        details = get_details(media_id, media_type)
+        details = await get_details_async(media_id, media_type)
         if not details:
             await query.edit_message_text("Could not fetch details.")
             return
@@ -1416,15 +1762,44 @@ async def openrec_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("Error fetching details. Please try again.")
 
 
+# Single-entry callback routing: instead of registering one pattern-matched
+# CallbackQueryHandler per prefix (each click then pays up to ten regex
+# evaluations inside PTB), register callback_dispatch alone and route on the
+# prefix with one dict lookup.
+_CALLBACK_DISPATCH = {
+    "movie": button_handler,
+    "tv": button_handler,
+    "asklib": asklib_wrapper,
+    "lib": library_handler,
+    "season": season_handler,
+    "confirm": confirm_handler,
+    "cancel": cancel_handler,
+    "recommend": recommend_handler,
+    "openrec": openrec_handler,
+    "delreq": delete_request_handler,
+    "myreq": myrequests_page_handler,
+}
+
+
+async def callback_dispatch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Route a callback query to its handler based on the data prefix."""
+    data = update.callback_query.data or ""
+    handler = _CALLBACK_DISPATCH.get(data.split(":", 1)[0])
+    if handler is not None:
+        await handler(update, context)
+
+
+# Recommendation lists barely change, so a long TTL is safe here
+@ttl_cache(maxsize=256, ttl=3600, key=lambda media_id, media_type, limit=10: (media_type, media_id, limit))
 def get_recommendations(media_id, media_type: str, limit: int = 10) -> list:
     """Get recommendations from Overseerr API."""
     try:
-        url = f"{OVERSEERR_URL}/{media_type}/{media_id}/recommendations"
+        url = f"{OVERSEERR_API_URL}/{media_type}/{media_id}/recommendations"
         headers = {"X-Api-Key": OVERSEERR_API_KEY}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = _SESSION.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         data = response.json()
-        return data.get("results", [])[:limit]
+        return [normalize_item(r) for r in data.get("results", [])[:limit]]
     except Exception as e:
         logger.exception("get_recommendations error: %s", e)
         return []
@@ -1447,7 +1822,7 @@ def tmdb_search(query: str, media_type: str, limit: int = 10) -> list:
             "page": 1
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = _SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         results = data.get("results", [])[:limit]
@@ -1457,6 +1832,7 @@ def tmdb_search(query: str, media_type: str, limit: int = 10) -> list:
             r["media_type"] = media_type
             if "poster_path" in r:
                 r["posterPath"] = r["poster_path"]
+            normalize_item(r)
 
         return results
 
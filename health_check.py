@@ -1,13 +1,28 @@
 # health_check.py
 """
 Simple HTTP health check endpoint for monitoring bot status.
+
+The endpoint runs on the bot's own asyncio loop (via asyncio.start_server)
+rather than a dedicated thread, so liveness probes don't cost an extra OS
+thread or GIL round-trips.
 """
+import asyncio
 import logging
 import json
+import threading
 import time
 from datetime import datetime
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from threading import Thread
+
+# orjson serializes several times faster and emits bytes directly; fall
+# back to stdlib json so the endpoint works without it.
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 logger = logging.getLogger(__name__)
 
@@ -24,20 +39,44 @@ class BotHealthStatus:
             cls._instance.total_requests = 0
             cls._instance.api_errors = 0
             cls._instance.is_healthy = True
+            # Counters are bumped from worker threads while the health
+            # endpoint reads them, so guard them with a lock.
+            cls._instance._lock = threading.Lock()
+            cls._instance._cached_bytes = b""
+            cls._instance._cache_time = 0.0
+            # Per-thread pending request counts, flushed to the shared
+            # counter in batches to avoid taking the lock on every call.
+            cls._instance._local = threading.local()
         return cls._instance
-    
+
+    # Flush a thread's pending requests after this many increments or this
+    # much time, whichever comes first. /health may lag by a few counts.
+    _FLUSH_BATCH = 32
+    _FLUSH_SECONDS = 1.0
+
     def update_activity(self):
         """Update last activity timestamp."""
+        # Plain float overwrite; a dirty read is tolerable here.
         self.last_activity = time.time()
-    
+
     def increment_requests(self):
-        """Increment total request counter."""
-        self.total_requests += 1
-    
+        """Increment total request counter (batched per thread)."""
+        local = self._local
+        pending = getattr(local, "pending", 0) + 1
+        now = time.monotonic()
+        if pending >= self._FLUSH_BATCH or now - getattr(local, "last_flush", 0.0) > self._FLUSH_SECONDS:
+            with self._lock:
+                self.total_requests += pending
+            local.pending = 0
+            local.last_flush = now
+        else:
+            local.pending = pending
+
     def increment_errors(self):
         """Increment API error counter."""
-        self.api_errors += 1
-    
+        with self._lock:
+            self.api_errors += 1
+
     def get_status(self) -> dict:
         """Get current health status."""
         uptime = time.time() - self.start_time
@@ -52,7 +91,20 @@ class BotHealthStatus:
             "api_errors": self.api_errors,
             "timestamp": datetime.now().isoformat()
         }
-    
+
+    def get_status_bytes(self) -> bytes:
+        """Get the JSON-encoded status, re-serializing at most once a second.
+
+        Frequent scrapers (k8s probes every 1-10s) hit the cached bytes and
+        skip the dict build + json.dumps on the hot path.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._cache_time > 1.0 or not self._cached_bytes:
+                self._cached_bytes = _dumps(self.get_status())
+                self._cache_time = now
+            return self._cached_bytes
+
     @staticmethod
     def _format_uptime(seconds: float) -> str:
         """Format uptime in human-readable format."""
@@ -62,39 +114,49 @@ class BotHealthStatus:
         return f"{days}d {hours}h {minutes}m"
 
 
-class HealthCheckHandler(BaseHTTPRequestHandler):
-    """HTTP handler for health check endpoint."""
-    
-    def do_GET(self):
-        """Handle GET request."""
-        if self.path == '/health' or self.path == '/':
-            status = BotHealthStatus().get_status()
-            
-            self.send_response(200)
-            self.send_header('Content-type', 'application/json')
-            self.end_headers()
-            self.wfile.write(json.dumps(status, indent=2).encode())
+async def _handle_health_request(reader, writer):
+    """Serve a single health-check GET and close the connection."""
+    try:
+        request_line = await reader.readline()
+        # Drain the (tiny) header block; probes don't send bodies
+        while True:
+            line = await reader.readline()
+            if not line or line in (b"\r\n", b"\n"):
+                break
+
+        parts = request_line.split()
+        path = parts[1].decode("latin-1", "replace") if len(parts) >= 2 else "/"
+
+        if path == '/health' or path == '/':
+            body = BotHealthStatus().get_status_bytes()
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                b"Connection: close\r\n\r\n" + body
+            )
         else:
-            self.send_response(404)
-            self.end_headers()
-    
-    def log_message(self, format, *args):
-        """Suppress default HTTP logging."""
+            writer.write(
+                b"HTTP/1.1 404 Not Found\r\n"
+                b"Content-Length: 0\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+        await writer.drain()
+    except Exception:
         pass
+    finally:
+        writer.close()
 
 
-def start_health_check_server(port: int = 8080):
-    """Start health check HTTP server in background thread."""
-    def run_server():
-        try:
-            server = HTTPServer(('0.0.0.0', port), HealthCheckHandler)
-            logger.info(f"✅ Health check server started on port {port}")
-            server.serve_forever()
-        except Exception as e:
-            logger.error(f"❌ Failed to start health check server: {e}")
-    
-    thread = Thread(target=run_server, daemon=True)
-    thread.start()
+async def start_health_check_server(port: int = 8080):
+    """Start the health check HTTP server on the running event loop."""
+    try:
+        server = await asyncio.start_server(_handle_health_request, '0.0.0.0', port)
+        logger.info(f"✅ Health check server started on port {port}")
+        return server
+    except Exception as e:
+        logger.error(f"❌ Failed to start health check server: {e}")
+        return None
 
 
 def get_health_status():
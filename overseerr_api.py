@@ -1,17 +1,24 @@
 # overseerr_api.py
+import asyncio
 import requests
 import logging
 import os
-import urllib.parse
+import threading
+import random
+import re
 import time
 from typing import Tuple, Dict, Any
+from collections import deque
 from functools import wraps
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 from config import (
     OVERSEERR_API_URL,
     TELEGRAMBOT_USERNAME,
     TELEGRAMBOT_PASSWORD,
 )
+from utils import normalize_item
 
 # Ensure log directory exists
 LOG_DIR = "/home/azra3l/logs"
@@ -33,11 +40,104 @@ logger = logging.getLogger(__name__)
 logger.info("✅ Logging started for %s", __file__)
 
 
+# orjson decodes the larger Overseerr payloads (discover pages, tv details
+# with seasons) several times faster than stdlib json; optional dependency.
+try:
+    import orjson
+
+    def _json(resp):
+        return orjson.loads(resp.content)
+except ImportError:
+    orjson = None
+
+    def _json(resp):
+        return resp.json()
+
+
 session = requests.Session()
+# Default adapters only keep 10 pooled connections; size the pool for
+# concurrent handler traffic so bursts reuse warm TCP+TLS connections
+# instead of renegotiating, and ask for compressed JSON bodies.
+_adapter = requests.adapters.HTTPAdapter(pool_connections=32, pool_maxsize=64, pool_block=False)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+session.headers["Connection"] = "keep-alive"
+session.headers["Accept-Encoding"] = "gzip"
+del _adapter
+
+# lru-dict provides a C-implemented bounded LRU for the response caches
+# below; a plain dict (insertion-ordered, evict oldest) is the fallback.
+try:
+    from lru import LRU as _LRU
+except ImportError:
+    _LRU = None
 
 
-def retry_on_failure(max_retries=3, backoff_factor=2, exceptions=(requests.exceptions.RequestException,)):
-    """Decorator to retry functions with exponential backoff on failure."""
+# Marker for cached negative lookups (e.g. Overseerr 404s)
+_NOT_FOUND = object()
+
+
+def ttl_cache(maxsize=512, ttl=120, key=None, negative_ttl=None):
+    """
+    Decorator that memoizes results for `ttl` seconds, bounded to `maxsize`
+    entries. Repeat searches for popular titles then resolve from memory
+    instead of costing an HTTPS round-trip to Overseerr per call.
+
+    With `negative_ttl` set, 404 responses are also cached (for that many
+    seconds) and replayed as HTTPError without touching the network, so
+    retries on items Overseerr doesn't know go straight to the fallback.
+    Callers that need fresh data can pass `cache_=False` to bypass lookup.
+    """
+    def decorator(func):
+        cache = _LRU(maxsize) if _LRU is not None else {}
+
+        @wraps(func)
+        def wrapper(*args, cache_=True, **kwargs):
+            k = key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            if cache_:
+                hit = cache.get(k)
+                if hit is not None:
+                    if hit[1] is _NOT_FOUND:
+                        if now - hit[0] < negative_ttl:
+                            raise hit[2]
+                    elif now - hit[0] < ttl:
+                        return hit[1]
+            try:
+                result = func(*args, **kwargs)
+            except requests.exceptions.HTTPError as e:
+                if (negative_ttl and e.response is not None
+                        and e.response.status_code == 404):
+                    if _LRU is None and len(cache) >= maxsize:
+                        cache.pop(next(iter(cache)))
+                    cache[k] = (now, _NOT_FOUND, e)
+                raise
+            if _LRU is None and len(cache) >= maxsize:
+                # dict fallback: drop the oldest insertion
+                cache.pop(next(iter(cache)))
+            cache[k] = (now, result)
+            return result
+
+        def _pop(k):
+            try:
+                del cache[k]
+            except KeyError:
+                pass
+
+        wrapper.cache_clear = cache.clear
+        wrapper.cache_pop = _pop
+        return wrapper
+    return decorator
+
+
+def retry_on_failure(max_retries=3, backoff_factor=2, cap=60, exceptions=(requests.exceptions.RequestException,)):
+    """
+    Decorator to retry functions with exponential backoff on failure.
+
+    Waits use full jitter — uniform in [0, min(cap, backoff_factor**attempt)]
+    — so concurrent callers retrying after the same outage spread out
+    instead of hammering Overseerr in lockstep.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -48,8 +148,8 @@ def retry_on_failure(max_retries=3, backoff_factor=2, exceptions=(requests.excep
                     if attempt == max_retries - 1:
                         logger.error(f"{func.__name__} failed after {max_retries} attempts: {e}")
                         raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {e}")
+                    wait_time = random.uniform(0, min(cap, backoff_factor ** attempt))
+                    logger.warning(f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time:.2f}s: {e}")
                     time.sleep(wait_time)
             return None
         return wrapper
@@ -67,18 +167,93 @@ def get_session_cookie():
     if "connect.sid" not in session.cookies.get_dict():
         raise Exception("❌ Failed to log in to Overseerr. Check credentials.")
 
-    print("✅ Logged in as telegrambot user, session cookie acquired.")
+    logger.info("✅ Logged in as telegrambot user, session cookie acquired.")
+
+
+class TokenBucket:
+    """
+    Simple blocking token bucket. Shapes outbound traffic client-side so a
+    burst (e.g. a discover page fanning out into detail fetches) queues here
+    instead of turning into a volley of 429s and wasted retries.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+_BUCKET = TokenBucket(
+    rate=float(os.getenv("OVERSEERR_RATE", "5")),
+    capacity=float(os.getenv("OVERSEERR_BURST", "10")),
+)
+
+
+def _retry_after_seconds(resp) -> float | None:
+    """Parse a Retry-After header (seconds or HTTP-date) into seconds."""
+    raw = resp.headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(raw)
+        return max(0.0, (dt - datetime.now(dt.tzinfo)).total_seconds())
+    except Exception:
+        return None
+
+
+# Only one worker re-authenticates when the session expires; everyone else
+# piling in with a 401 waits on the lock and reuses the fresh cookie
+# instead of storming /auth/local and trampling each other's sessions.
+_auth_lock = threading.Lock()
+_last_auth = 0.0
+
+
+def _relogin():
+    """Single-flight session refresh shared by all workers."""
+    global _last_auth
+    with _auth_lock:
+        if time.monotonic() - _last_auth > 5:
+            get_session_cookie()
+            _last_auth = time.monotonic()
 
 
 @retry_on_failure(max_retries=3, backoff_factor=2)
 def overseerr_request(method: str, endpoint: str, **kwargs) -> requests.Response:
     """Wrapper for Overseerr API calls with auto re-login on 401 Unauthorized."""
+    _BUCKET.acquire()
     url = f"{OVERSEERR_API_URL}{endpoint}"
     resp = session.request(method, url, **kwargs)
 
     if resp.status_code == 401:
-        print("⚠️  Session expired, re-logging in...")
-        get_session_cookie()
+        logger.warning("⚠️  Session expired, re-logging in...")
+        _relogin()
+        resp = session.request(method, url, **kwargs)
+
+    # When throttled (or briefly unavailable), wait exactly as long as the
+    # server asks plus a little jitter instead of guessing with blind backoff.
+    for _ in range(2):
+        if resp.status_code not in (429, 503):
+            break
+        delay = _retry_after_seconds(resp)
+        if delay is None:
+            break  # no hint — leave it to retry_on_failure's jittered backoff
+        time.sleep(min(delay, 60) + random.uniform(0, 1))
         resp = session.request(method, url, **kwargs)
 
     resp.raise_for_status()
@@ -96,27 +271,36 @@ def debug_fetch_overseerr(url: str, params: dict = None, headers: dict = None) -
     """
     try:
         resp = overseerr_request("GET", url, params=params or {}, headers=headers or {})
-        data = resp.json()
+        data = _json(resp)
     except Exception as e:
-        print(f"[Overseerr DEBUG] request failed: {e}")
+        logger.debug("[Overseerr DEBUG] request failed: %s", e)
         return None
 
-    import json
-    pretty = json.dumps(data, indent=2)[:20000]  # truncated to keep logs sane
-    print("[Overseerr DEBUG] full JSON response (truncated):")
-    print(pretty)
+    if logger.isEnabledFor(logging.DEBUG):
+        # Pretty-print for the log but keep it bounded: encode with orjson
+        # when available and cut at 20KB rather than formatting everything.
+        if orjson is not None:
+            pretty = orjson.dumps(data, option=orjson.OPT_INDENT_2)[:20000].decode("utf-8", "replace")
+        else:
+            import json
+            pretty = json.dumps(data, indent=2)[:20000]
+        if len(pretty) >= 20000:
+            pretty += "...[truncated]"
+        logger.debug("[Overseerr DEBUG] full JSON response (truncated):\n%s", pretty)
     return data
 
 
+@ttl_cache(maxsize=512, ttl=120, key=lambda query, media_type: (query.lower().strip(), media_type))
 def search_media(query: str, media_type: str):
     """Search endpoint wrapper — returns list of matching items with details."""
-    encoded_query = urllib.parse.quote(query)
-    resp = overseerr_request("GET", "/search", params={"query": encoded_query})
-    results = resp.json().get("results", [])
+    # requests URL-encodes params itself; pre-quoting here double-encoded
+    # spaces/accents (%2520) and made those searches return nothing.
+    resp = overseerr_request("GET", "/search", params={"query": query})
+    results = _json(resp).get("results", [])
     parsed = []
     for r in results:
         if r.get("mediaType") == media_type:
-            parsed.append({
+            parsed.append(normalize_item({
                 # prefer tmdbId if available so IDs are consistent with TMDB
                 "id": r.get("tmdbId", r.get("id")),
                 "title": r.get("title") or r.get("name"),
@@ -125,38 +309,104 @@ def search_media(query: str, media_type: str):
                 "firstAirDate": r.get("firstAirDate"),
                 "voteAverage": r.get("voteAverage"),
                 "overview": r.get("overview"),
-            })
+                # /search already embeds the library state; carrying it along
+                # lets callers resolve canonical status without a follow-up
+                # /movie/{id} or /tv/{id} fetch per result.
+                "mediaInfo": r.get("mediaInfo"),
+                "status": r.get("status"),
+            }))
     return parsed
 
 
+# Details are more stable than search result ordering, so they get a longer
+# TTL; 404s are remembered briefly so retries fall back without a round-trip.
+@ttl_cache(maxsize=512, ttl=600, negative_ttl=60, key=lambda media_id, media_type: (media_id, media_type))
 def get_details(media_id: int, media_type: str) -> dict:
     """Return the full JSON details for a media item (movie/tv)."""
     resp = overseerr_request("GET", f"/{media_type}/{media_id}")
-    return resp.json()
+    return _json(resp)
+
+
+async def get_details_many(pairs, concurrency: int = 10):
+    """
+    Fetch details for many (media_id, media_type) pairs concurrently.
+
+    Each lookup runs in a worker thread over the pooled session, gated by a
+    semaphore so a large batch (search page, discover sweep) issues up to
+    `concurrency` round-trips in flight instead of paying them sequentially.
+    Returns results in input order; failed lookups come back as exceptions.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(media_id, media_type):
+        async with sem:
+            return await asyncio.to_thread(get_details, media_id, media_type)
+
+    return await asyncio.gather(
+        *(_one(m, t) for m, t in pairs),
+        return_exceptions=True
+    )
+
+
+_SEARCH_KEY_HINTS = ("status", "available")
 
 
 def _search_for_keys(obj):
-    """Recursive helper that looks for keys that look like status/available."""
-    if isinstance(obj, dict):
-        for k, v in obj.items():
-            key_lower = k.lower()
-            if "status" in key_lower:
-                return (v, f'key:{k}')
-            if "available" in key_lower:
-                # available may be boolean or string
-                return (v, f'key:{k}')
-            if isinstance(v, (dict, list)):
-                result = _search_for_keys(v)
-                if result:
-                    return result
-    elif isinstance(obj, list):
-        for item in obj:
-            result = _search_for_keys(item)
-            if result:
-                return result
+    """
+    Find the first key that looks like status/available in arbitrarily nested
+    JSON. Iterative DFS with an explicit stack — no per-level Python frames
+    and no RecursionError on deep mediaInfo trees.
+    """
+    stack = deque([obj])
+    while stack:
+        cur = stack.pop()
+        if isinstance(cur, dict):
+            children = []
+            for k, v in cur.items():
+                key_lower = k.lower()
+                # status may be numeric; available may be boolean or string
+                if any(hint in key_lower for hint in _SEARCH_KEY_HINTS):
+                    return (v, f'key:{k}')
+                if isinstance(v, (dict, list)):
+                    children.append(v)
+            stack.extend(reversed(children))
+        elif isinstance(cur, list):
+            stack.extend(reversed(cur))
     return None
 
 
+# Exact-match table for _normalize_status: one dict probe covers the common
+# representations before any substring scanning happens.
+_STATUS_EXACT = {
+    "AVAILABLE": "AVAILABLE",
+    "TRUE": "AVAILABLE",
+    "YES": "AVAILABLE",
+    "1": "AVAILABLE",
+    "MISSING": "MISSING",
+    "FALSE": "MISSING",
+    "NO": "MISSING",
+    "0": "MISSING",
+    "NOT AVAILABLE": "MISSING",
+    "UNAVAILABLE": "MISSING",
+    "MEDIA_AVAILABLE": "AVAILABLE",
+    "MEDIA_MISSING": "MISSING",
+    "PARTIALLY_AVAILABLE": "PARTIALLY_AVAILABLE",
+    "DECLINED": "DECLINED",
+    "PENDING": "PENDING",
+}
+
+# Substring fallbacks collapsed into one compiled alternation: a single
+# C-level scan instead of five Python-level `in` tests per call.
+_STATUS_PATTERNS = re.compile(r"(PARTIAL|PENDING|PROCESS|DECLIN|DENIED)")
+_STATUS_PATTERN_MAP = {
+    "PARTIAL": "PARTIALLY_AVAILABLE",
+    "PENDING": "PENDING",
+    "PROCESS": "PROCESSING",
+    "DECLIN": "DECLINED",
+    "DENIED": "DECLINED",
+}
+
+
 def _normalize_status(raw_value) -> str:
     """
     Normalize different possible representations into canonical strings:
@@ -183,38 +433,44 @@ def _normalize_status(raw_value) -> str:
     # String handling
     v = str(raw_value).strip().upper()
 
-    # Common variations
-    if v in {"AVAILABLE", "TRUE", "YES", "1"}:
-        return "AVAILABLE"
-    if v in {"MISSING", "FALSE", "NO", "0", "NOT AVAILABLE", "UNAVAILABLE"}:
-        return "MISSING"
-    if "PARTIAL" in v:
-        return "PARTIALLY_AVAILABLE"
-    if "PENDING" in v:
-        return "PENDING"
-    if "PROCESS" in v:
-        return "PROCESSING"
-    if "DECLIN" in v or "DENIED" in v:
-        return "DECLINED"
-    if "REQUEST" in v and "PENDING" in v:
-        return "PENDING"
-
-    # If it looks like a request.status object (e.g., "Available", "Missing", etc)
-    # try mapping a few known values
-    mapping = {
-        "MEDIA_AVAILABLE": "AVAILABLE",
-        "MEDIA_MISSING": "MISSING",
-        "PARTIALLY_AVAILABLE": "PARTIALLY_AVAILABLE",
-        "DECLINED": "DECLINED",
-        "PENDING": "PENDING",
-    }
-    if v in mapping:
-        return mapping[v]
+    exact = _STATUS_EXACT.get(v)
+    if exact is not None:
+        return exact
+
+    m = _STATUS_PATTERNS.search(v)
+    if m:
+        return _STATUS_PATTERN_MAP[m.group(1)]
 
     # fallback
     return v
 
 
+# Canonical status tables for get_canonical_status, hoisted to module scope
+# so they're built once instead of per call.
+_STATUS_MAP = {
+    1: "PENDING",
+    2: "PROCESSING",
+    3: "PARTIALLY_AVAILABLE",
+    4: "AVAILABLE",
+    True: "AVAILABLE",
+    False: "UNKNOWN",
+    "UNKNOWN": "UNKNOWN",
+    "PENDING": "PENDING",
+    "PROCESSING": "PROCESSING",
+    "PARTIALLY_AVAILABLE": "PARTIALLY_AVAILABLE",
+    "AVAILABLE": "AVAILABLE",
+    "READY": "AVAILABLE",
+    "COMPLETED": "AVAILABLE",
+    "COMPLETE": "AVAILABLE",
+    "DONE": "AVAILABLE",
+    # Common series lifecycle strings from TMDb/Overseerr that are NOT availability:
+    "RETURNING SERIES": "UNKNOWN",
+    "ENDED": "UNKNOWN",
+    "CANCELED": "UNKNOWN",
+    "CANCELLED": "UNKNOWN",
+    "IN PRODUCTION": "UNKNOWN",
+}
+
 def get_canonical_status(media, media_type: str | None = None, requested_seasons: list[int] | None = None, session_cookie: str | None = None):
     """
     Flexible canonical status resolver.
@@ -227,40 +483,6 @@ def get_canonical_status(media, media_type: str | None = None, requested_seasons
       - status ∈ {"AVAILABLE", "PARTIALLY_AVAILABLE", "PROCESSING", "PENDING", "UNKNOWN"}
       - meta: {"source": <string>} describing which path determined the result
     """
-    # --- helpers -------------------------------------------------------------
-    def _safe_get(obj, *path):
-        cur = obj
-        for p in path:
-            if isinstance(cur, dict):
-                cur = cur.get(p)
-            else:
-                return None
-        return cur
-
-    STATUS_MAP = {
-        1: "PENDING",
-        2: "PROCESSING",
-        3: "PARTIALLY_AVAILABLE",
-        4: "AVAILABLE",
-        True: "AVAILABLE",
-        False: "UNKNOWN",
-        "UNKNOWN": "UNKNOWN",
-        "PENDING": "PENDING",
-        "PROCESSING": "PROCESSING",
-        "PARTIALLY_AVAILABLE": "PARTIALLY_AVAILABLE",
-        "AVAILABLE": "AVAILABLE",
-        "READY": "AVAILABLE",
-        "COMPLETED": "AVAILABLE",
-        "COMPLETE": "AVAILABLE",
-        "DONE": "AVAILABLE",
-        # Common series lifecycle strings from TMDb/Overseerr that are NOT availability:
-        "RETURNING SERIES": "UNKNOWN",
-        "ENDED": "UNKNOWN",
-        "CANCELED": "UNKNOWN",
-        "CANCELLED": "UNKNOWN",
-        "IN PRODUCTION": "UNKNOWN",
-    }
-
     # --- normalize input to a dict ------------------------------------------
     media_data = None
     if isinstance(media, dict):
@@ -277,29 +499,31 @@ def get_canonical_status(media, media_type: str | None = None, requested_seasons
         return "UNKNOWN", {"source": "no_media_dict"}
 
     # --- direct paths to try -------------------------------------------------
-    candidates = [
-        ("mediaInfo.status", _safe_get(media_data, "mediaInfo", "status")),
-        ("media.status",     _safe_get(media_data, "media", "status")),
-        ("status",           _safe_get(media_data, "status")),
-        ("mediaInfo.available",   _safe_get(media_data, "mediaInfo", "available")),
-        ("media.available",       _safe_get(media_data, "media", "available")),
-        ("mediaInfo.isAvailable", _safe_get(media_data, "mediaInfo", "isAvailable")),
-        ("media.isAvailable",     _safe_get(media_data, "media", "isAvailable")),
-    ]
-
-    for path, value in candidates:
+    # The candidate paths are short and statically known, so resolve the two
+    # sub-dicts once and probe with direct .get calls rather than looping a
+    # variadic helper per candidate.
+    mi = media_data.get("mediaInfo")
+    mi = mi if isinstance(mi, dict) else {}
+    md = media_data.get("media")
+    md = md if isinstance(md, dict) else {}
+
+    for label, value in (
+        ("mediaInfo.status", mi.get("status")),
+        ("media.status", md.get("status")),
+        ("status", media_data.get("status")),
+        ("mediaInfo.available", mi.get("available")),
+        ("media.available", md.get("available")),
+        ("mediaInfo.isAvailable", mi.get("isAvailable")),
+        ("media.isAvailable", md.get("isAvailable")),
+    ):
         if value is None:
             continue
-        norm = STATUS_MAP.get(value, STATUS_MAP.get(str(value).upper(), "UNKNOWN"))
+        norm = _STATUS_MAP.get(value, _STATUS_MAP.get(str(value).upper(), "UNKNOWN"))
         if norm != "UNKNOWN":
-            return norm, {"source": path}
+            return norm, {"source": label}
 
     # --- TV season-level logic ----------------------------------------------
-    container = (
-        _safe_get(media_data, "mediaInfo")
-        or _safe_get(media_data, "media")
-        or media_data
-    )
+    container = mi or md or media_data
     seasons = container.get("seasons") if isinstance(container, dict) else None
     if isinstance(seasons, list) and seasons:
         def _is_full(s):
@@ -324,7 +548,7 @@ def get_canonical_status(media, media_type: str | None = None, requested_seasons
 
     # --- linked-library fallback (presence implies available) ----------------
     for key in ("plexId", "ratingKey", "jellyfinId", "tautulliId"):
-        if _safe_get(media_data, "mediaInfo", key) or _safe_get(media_data, "media", key):
+        if mi.get(key) or md.get(key):
             return "AVAILABLE", {"source": f"id:{key}"}
 
     return "UNKNOWN", {"source": "fallback"}
@@ -341,65 +565,42 @@ def request_media(media_id: int, media_type: str, seasons=None, library_id=None)
     if library_id:
         data["rootFolderId"] = library_id
 
-    print("➡️ Sending request payload:", data)  # Debug log
+    logger.debug("➡️ Sending request payload: %s", data)
 
     resp = overseerr_request("POST", "/request", json=data)
-    print("⬅️ Overseerr response:", resp.text)  # Debug log
+    logger.debug("⬅️ Overseerr response: %s", resp.text)
     resp.raise_for_status()
-    return resp.json()
+    return _json(resp)
 
 
 def delete_request(request_id: int):
     """Delete a request from Overseerr."""
     resp = overseerr_request("DELETE", f"/request/{request_id}")
     resp.raise_for_status()
-    return resp.json()
+    return _json(resp)
 
 
 # --- Compatibility shim so callers can always do: get_media_details(id, type) ---
 def get_media_details(media_id, media_type, session_cookie=None):
     """
     Return Overseerr media details for a TMDb id.
-    Tries existing helpers if present; otherwise falls back to a direct HTTP call.
-    """
-    # 1) Try known helper names with/without 'session_cookie'
-    try:
-        # common alt name
-        from overseerr_api import get_details as _get_details  # self-import safe
-    except Exception:
-        _get_details = None
-
-    try:
-        # another common alt
-        from overseerr_api import fetch_media_details as _fetch_details  # type: ignore
-    except Exception:
-        _fetch_details = None
 
-    # Prefer get_details if present
-    fn = _get_details or _fetch_details
-    if fn:
-        try:
-            return fn(media_id, media_type, session_cookie=session_cookie)  # type: ignore
-        except TypeError:
-            # Helper doesn’t accept session_cookie → retry without it
-            return fn(media_id, media_type)  # type: ignore
-
-    # 2) Fallback: direct HTTP to Overseerr
-    import requests
-    from config import OVERSEERR_URL, OVERSEERR_API_KEY
-    headers = {"X-Api-Key": OVERSEERR_API_KEY}
-    t = "movie" if media_type == "movie" else "tv"
-    resp = requests.get(f"{OVERSEERR_URL}/api/v1/{t}/{media_id}", headers=headers, timeout=15)
-    resp.raise_for_status()
-    return resp.json()
+    Thin compatibility shim over get_details: the session_cookie argument is
+    accepted (and ignored — auth rides on the module session) so older
+    call sites keep working without the per-call import probing this used
+    to do.
+    """
+    return get_details(media_id, media_type)
 
 
+# Trending pages move slowly; serving /browse repeats from memory is fine.
+@ttl_cache(maxsize=64, ttl=300, key=lambda media_type="movie", page=1: (media_type, page))
 def get_discover_content(media_type: str = "movie", page: int = 1):
     """Get popular/trending content from Overseerr discover endpoint."""
     # Overseerr uses plural form in endpoint
     endpoint_type = "movies" if media_type == "movie" else "tv"
     resp = overseerr_request("GET", f"/discover/{endpoint_type}", params={"page": page, "language": "en"})
-    results = resp.json().get("results", [])
+    results = _json(resp).get("results", [])
     parsed = []
     for r in results:
         parsed.append({
@@ -415,7 +616,9 @@ def get_discover_content(media_type: str = "movie", page: int = 1):
     return parsed
 
 
+# Short TTL: status changes matter, but /status bursts hit the same ids.
+@ttl_cache(maxsize=512, ttl=15, key=lambda request_id: request_id)
 def get_request_status(request_id: int):
     """Get status of a specific Overseerr request."""
     resp = overseerr_request("GET", f"/request/{request_id}")
-    return resp.json()
+    return _json(resp)
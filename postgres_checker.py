@@ -3,9 +3,12 @@
 Direct Postgres integration to check actual Radarr/Sonarr availability.
 This bypasses Overseerr and checks the actual media server database.
 """
+import asyncio
 import logging
+import threading
 import psycopg2
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool
 from typing import Optional, Dict, Tuple
 from contextlib import contextmanager
 
@@ -22,28 +25,50 @@ class PostgresChecker:
         self.user = user
         self.password = password
         self.schema = schema
-        self._connection = None
-    
+        # Connection pool, created lazily on first use so constructing the
+        # checker never touches the network (matches the old per-call
+        # connect behavior when the database is down at startup).
+        self._pool: Optional[ThreadedConnectionPool] = None
+        self._pool_lock = threading.Lock()
+
+    def _ensure_pool(self) -> ThreadedConnectionPool:
+        """Create the connection pool on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadedConnectionPool(
+                        minconn=1,
+                        maxconn=16,
+                        host=self.host,
+                        port=self.port,
+                        database=self.database,
+                        user=self.user,
+                        password=self.password,
+                        connect_timeout=5
+                    )
+        return self._pool
+
     @contextmanager
     def _get_connection(self):
-        """Context manager for database connections."""
+        """Context manager that borrows a pooled connection."""
+        pool = None
         conn = None
         try:
-            conn = psycopg2.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                connect_timeout=5
-            )
+            pool = self._ensure_pool()
+            conn = pool.getconn()
             yield conn
         except Exception as e:
             logger.error(f"Postgres connection failed: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            if conn is not None:
+                pool.putconn(conn)
+
+    def close_all(self):
+        """Close every pooled connection (shutdown hook)."""
+        if self._pool is not None:
+            self._pool.closeall()
+            self._pool = None
     
     def check_movie_availability(self, tmdb_id: int) -> Tuple[bool, Optional[Dict]]:
         """
@@ -94,7 +119,45 @@ class PostgresChecker:
             logger.exception(f"Error checking movie availability for tmdbid={tmdb_id}: {e}")
             return False, None
     
-    def check_tv_availability(self, tvdb_id: Optional[int] = None, tmdb_id: Optional[int] = None, 
+    def check_movies_availability(self, tmdb_ids) -> Dict[int, Dict]:
+        """
+        Batch variant of check_movie_availability: one round-trip for a whole
+        page of results instead of a query per title.
+
+        Args:
+            tmdb_ids: Iterable of TMDB IDs to look up
+
+        Returns:
+            Dict mapping tmdb_id -> movie row dict (missing ids are absent)
+        """
+        ids = list(tmdb_ids)
+        if not ids:
+            return {}
+
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+                    query = f"""
+                        SELECT
+                            tmdbid,
+                            title,
+                            year,
+                            hasfile,
+                            isavailable,
+                            status,
+                            path,
+                            sizeondisk
+                        FROM {self.schema}.radarr
+                        WHERE tmdbid = ANY(%s)
+                    """
+                    cursor.execute(query, (ids,))
+                    return {row['tmdbid']: dict(row) for row in cursor.fetchall()}
+
+        except Exception as e:
+            logger.exception(f"Error batch-checking movie availability for {len(ids)} ids: {e}")
+            return {}
+
+    def check_tv_availability(self, tvdb_id: Optional[int] = None, tmdb_id: Optional[int] = None,
                              season_number: Optional[int] = None) -> Tuple[bool, Optional[Dict]]:
         """
         Check if a TV show (or specific season) is available in Sonarr.
@@ -117,72 +180,151 @@ class PostgresChecker:
             with self._get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cursor:
                     # Try TVDB first, then fall back to TMDB (less reliable for TV)
-                    if tvdb_id:
+                    if not tvdb_id:
+                        # Note: Sonarr doesn't have tmdbid column, this is a limitation
+                        logger.warning("TMDB lookup for TV shows not directly supported - use TVDB ID")
+                        return False, None
+
+                    if season_number is not None:
+                        # Let Postgres pick out the one season object instead
+                        # of shipping the whole seasons array over the wire
+                        # (20+ season shows) and scanning it in Python.
                         query = f"""
-                            SELECT 
-                                id, tvdbid, title, year, status, path, seasons, monitored
+                            SELECT
+                                id, tvdbid, title, year, status, path, monitored,
+                                jsonb_path_query_first(
+                                    seasons::jsonb,
+                                    '$[*] ? (@.seasonNumber == $n)',
+                                    jsonb_build_object('n', %s::int)
+                                ) AS season
                             FROM {self.schema}.sonarr
                             WHERE tvdbid = %s
                         """
-                        cursor.execute(query, (tvdb_id,))
-                    else:
-                        # Note: Sonarr doesn't have tmdbid column, this is a limitation
-                        logger.warning("TMDB lookup for TV shows not directly supported - use TVDB ID")
-                        return False, None
-                    
+                        cursor.execute(query, (season_number, tvdb_id))
+                        result = cursor.fetchone()
+
+                        if not result:
+                            logger.debug(f"TV show tvdbid={tvdb_id} not found in Sonarr database")
+                            return False, None
+
+                        season = result.get('season')
+                        if not season:
+                            logger.debug(f"Season {season_number} not found for '{result['title']}'")
+                            return False, dict(result)
+
+                        stats = season.get('statistics', {})
+                        percent = stats.get('percentOfEpisodes', 0)
+                        episode_count = stats.get('episodeFileCount', 0)
+                        total_episodes = stats.get('totalEpisodeCount', 0)
+
+                        # Consider available if we have at least some episodes
+                        # or 100% of episodes available
+                        is_available = (percent == 100 or episode_count >= total_episodes) and episode_count > 0
+
+                        logger.info(
+                            f"TV show '{result['title']}' S{season_number:02d} - "
+                            f"{episode_count}/{total_episodes} episodes ({percent}%)"
+                        )
+
+                        return is_available, dict(result)
+
+                    query = f"""
+                        SELECT
+                            id, tvdbid, title, year, status, path, seasons, monitored
+                        FROM {self.schema}.sonarr
+                        WHERE tvdbid = %s
+                    """
+                    cursor.execute(query, (tvdb_id,))
                     result = cursor.fetchone()
-                    
+
                     if not result:
                         logger.debug(f"TV show tvdbid={tvdb_id} not found in Sonarr database")
                         return False, None
-                    
+
                     seasons = result.get('seasons', [])
                     if not seasons:
                         logger.debug(f"TV show '{result['title']}' has no season data")
                         return False, dict(result)
-                    
-                    # Check specific season or any season
-                    if season_number is not None:
-                        # Check specific season
-                        for season in seasons:
-                            if season.get('seasonNumber') == season_number:
-                                stats = season.get('statistics', {})
-                                percent = stats.get('percentOfEpisodes', 0)
-                                episode_count = stats.get('episodeFileCount', 0)
-                                total_episodes = stats.get('totalEpisodeCount', 0)
-                                
-                                # Consider available if we have at least some episodes
-                                # or 100% of episodes available
-                                is_available = (percent == 100 or episode_count >= total_episodes) and episode_count > 0
-                                
-                                logger.info(
-                                    f"TV show '{result['title']}' S{season_number:02d} - "
-                                    f"{episode_count}/{total_episodes} episodes ({percent}%)"
-                                )
-                                
-                                return is_available, dict(result)
-                        
-                        logger.debug(f"Season {season_number} not found for '{result['title']}'")
-                        return False, dict(result)
-                    else:
-                        # Check if ANY season has files
-                        has_any_files = False
-                        for season in seasons:
-                            stats = season.get('statistics', {})
-                            if stats.get('episodeFileCount', 0) > 0:
-                                has_any_files = True
-                                break
-                        
-                        logger.info(
-                            f"TV show '{result['title']}' - has_any_files={has_any_files}"
-                        )
-                        
-                        return has_any_files, dict(result)
-                    
+
+                    # Check if ANY season has files
+                    has_any_files = False
+                    for season in seasons:
+                        stats = season.get('statistics', {})
+                        if stats.get('episodeFileCount', 0) > 0:
+                            has_any_files = True
+                            break
+
+                    logger.info(
+                        f"TV show '{result['title']}' - has_any_files={has_any_files}"
+                    )
+
+                    return has_any_files, dict(result)
+
         except Exception as e:
             logger.exception(f"Error checking TV availability for tvdbid={tvdb_id}: {e}")
             return False, None
     
+    # Awaitable variants: the checks are I/O-latency-bound, so handlers that
+    # need movie + several season lookups back-to-back can asyncio.gather
+    # these instead of paying each round-trip sequentially. They run the
+    # pooled sync queries in worker threads.
+
+    async def check_movie_availability_async(self, tmdb_id: int) -> Tuple[bool, Optional[Dict]]:
+        """Awaitable wrapper around check_movie_availability."""
+        return await asyncio.to_thread(self.check_movie_availability, tmdb_id)
+
+    async def check_tv_availability_async(self, tvdb_id: Optional[int] = None, tmdb_id: Optional[int] = None,
+                                          season_number: Optional[int] = None) -> Tuple[bool, Optional[Dict]]:
+        """Awaitable wrapper around check_tv_availability."""
+        return await asyncio.to_thread(
+            self.check_tv_availability, tvdb_id=tvdb_id, tmdb_id=tmdb_id, season_number=season_number
+        )
+
+    async def check_movies_availability_async(self, tmdb_ids) -> Dict[int, Dict]:
+        """Awaitable wrapper around check_movies_availability."""
+        return await asyncio.to_thread(self.check_movies_availability, tmdb_ids)
+
+    def ensure_indexes(self):
+        """
+        Make sure tmdbid/tvdbid lookups are index scans, not seq-scans over
+        the whole Radarr/Sonarr tables. Creates covering indexes when the
+        role has privileges; otherwise logs the statements to run manually.
+        """
+        wanted = [
+            ("radarr", f"CREATE INDEX IF NOT EXISTS radarr_tmdbid_idx "
+                       f"ON {self.schema}.radarr (tmdbid) INCLUDE (hasfile, status, title, year)"),
+            ("sonarr", f"CREATE INDEX IF NOT EXISTS sonarr_tvdbid_idx "
+                       f"ON {self.schema}.sonarr (tvdbid)"),
+        ]
+        try:
+            with self._get_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT tablename, indexdef FROM pg_indexes "
+                        "WHERE schemaname = %s AND tablename IN ('radarr', 'sonarr')",
+                        (self.schema,)
+                    )
+                    indexdefs = {}
+                    for tablename, indexdef in cursor.fetchall():
+                        indexdefs.setdefault(tablename, []).append(indexdef)
+
+                    for table, ddl in wanted:
+                        col = "tmdbid" if table == "radarr" else "tvdbid"
+                        if any(col in d for d in indexdefs.get(table, [])):
+                            continue
+                        try:
+                            cursor.execute(ddl)
+                            conn.commit()
+                            logger.info(f"Created index on {self.schema}.{table} ({col})")
+                        except Exception as e:
+                            conn.rollback()
+                            logger.warning(
+                                f"Could not create index on {self.schema}.{table} ({col}): {e}. "
+                                f"Run manually: {ddl}"
+                            )
+        except Exception as e:
+            logger.warning(f"Index check skipped: {e}")
+
     def test_connection(self) -> bool:
         """Test if the database connection works."""
         try:
@@ -201,19 +343,19 @@ class PostgresChecker:
         try:
             with self._get_connection() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(f"SELECT COUNT(*) FROM {self.schema}.radarr")
-                    movie_count = cursor.fetchone()[0]
-                    
-                    cursor.execute(f"SELECT COUNT(*) FROM {self.schema}.radarr WHERE hasfile = true")
-                    movies_with_files = cursor.fetchone()[0]
-                    
-                    cursor.execute(f"SELECT COUNT(*) FROM {self.schema}.sonarr")
-                    show_count = cursor.fetchone()[0]
-                    
+                    # One round-trip for all three counts instead of three
+                    cursor.execute(f"""
+                        SELECT
+                            (SELECT COUNT(*) FROM {self.schema}.radarr) AS total_movies,
+                            (SELECT COUNT(*) FROM {self.schema}.radarr WHERE hasfile = true) AS movies_with_files,
+                            (SELECT COUNT(*) FROM {self.schema}.sonarr) AS total_shows
+                    """)
+                    row = cursor.fetchone()
+
                     return {
-                        'total_movies': movie_count,
-                        'movies_with_files': movies_with_files,
-                        'total_shows': show_count
+                        'total_movies': row[0],
+                        'movies_with_files': row[1],
+                        'total_shows': row[2]
                     }
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
@@ -228,6 +370,7 @@ def init_postgres_checker(host: str, port: int, database: str, user: str, passwo
     """Initialize the global PostgresChecker instance."""
     global _postgres_checker
     _postgres_checker = PostgresChecker(host, port, database, user, password, schema)
+    _postgres_checker.ensure_indexes()
     logger.info(f"PostgresChecker initialized: {host}:{port}/{database}")
 
 
@@ -2,29 +2,105 @@
 """
 Direct Radarr/Sonarr API integration for real-time availability checking.
 """
+import asyncio
 import logging
+import random
 import requests
+import threading
 import time
-from typing import Optional, Dict, Tuple
+from typing import Iterable, List, Optional, Dict, Tuple
 from functools import wraps
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+# Optional: stream-parse library lists instead of materializing the whole
+# JSON array before indexing it. Worthwhile on 10k+ item libraries.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class AdaptiveTokenBucket:
+    """
+    Shared retry budget: each retry spends a token, each success refunds a
+    fraction. When a backend is truly down the budget drains and callers
+    fail fast instead of multiplying load with per-caller backoff loops.
+    """
+
+    def __init__(self, capacity: float = 10.0, refill_rate: float = 1.0, refund: float = 0.5):
+        self.capacity = capacity
+        self.refill_rate = refill_rate  # tokens per second
+        self.refund_amount = refund
+        self._tokens = capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.refill_rate)
+        self._last = now
+
+    def try_acquire(self, amount: float = 1.0) -> bool:
+        with self._lock:
+            self._refill()
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return True
+            return False
+
+    def refund(self):
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens + self.refund_amount)
+
+
+# One budget per backend, shared across all callers and instances
+_RETRY_BUCKETS: Dict[str, AdaptiveTokenBucket] = {}
+_retry_buckets_lock = threading.Lock()
+
+
+def _retry_bucket(name: str) -> AdaptiveTokenBucket:
+    with _retry_buckets_lock:
+        bucket = _RETRY_BUCKETS.get(name)
+        if bucket is None:
+            bucket = _RETRY_BUCKETS[name] = AdaptiveTokenBucket()
+        return bucket
+
+
+def retry_on_failure(max_retries=3, backoff_factor=2, jitter=True, max_backoff=30.0, bucket=None):
+    """
+    Decorator to retry API calls with capped, jittered exponential backoff.
+
+    Full jitter (sleep anywhere in [0, base]) keeps concurrent callers from
+    retrying in lockstep against a backend that just hiccupped. When
+    `bucket` names a backend, retries draw on its shared token budget and
+    fail fast once it's exhausted.
+    """
+    budget = _retry_bucket(bucket) if bucket else None
 
-def retry_on_failure(max_retries=3, backoff_factor=2):
-    """Decorator to retry API calls with exponential backoff."""
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             for attempt in range(max_retries):
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    if budget and attempt:
+                        budget.refund()
+                    return result
                 except requests.exceptions.RequestException as e:
                     if attempt == max_retries - 1:
                         logger.error(f"{func.__name__} failed after {max_retries} attempts: {e}")
                         raise
-                    wait_time = backoff_factor ** attempt
-                    logger.warning(f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time}s: {e}")
+                    if budget and not budget.try_acquire():
+                        logger.error(f"{func.__name__}: retry budget for '{bucket}' exhausted, failing fast: {e}")
+                        raise
+                    wait_time = min(backoff_factor ** attempt, max_backoff)
+                    if jitter:
+                        wait_time = random.uniform(0, wait_time)
+                    logger.warning(f"{func.__name__} failed (attempt {attempt + 1}/{max_retries}), retrying in {wait_time:.1f}s: {e}")
                     time.sleep(wait_time)
             return None
         return wrapper
@@ -41,8 +117,98 @@ class RadarrSonarrAPI:
         self.sonarr_key = sonarr_key
         self.session = requests.Session()
         self.session.headers.update({'Accept': 'application/json'})
-    
-    @retry_on_failure(max_retries=3, backoff_factor=2)
+        # Keep-alive pool so repeated checks reuse sockets instead of
+        # paying a TCP+TLS handshake per request
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Library list caches: the /movie and /series endpoints return the
+        # whole library, so refetching them per check is pure waste. Each
+        # cache holds the id-indexed dict plus the ETag/Last-Modified
+        # validators from the last 200, and is refreshed at most once per
+        # _ttl seconds — with a 304 skipping the multi-MB JSON parse.
+        self._ttl = 90
+        self._cache_lock = threading.Lock()
+        self._movie_cache = {"ts": 0.0, "index": {}, "etag": None, "last_modified": None}
+        self._series_cache = {"ts": 0.0, "index": {}, "etag": None, "last_modified": None}
+        # Per-series episode lists, keyed by Sonarr series id
+        self._episode_cache: Dict[int, Tuple[float, list]] = {}
+
+    def _refresh_library(self, cache: Dict, url: str, api_key: str, id_key: str) -> Dict[int, Dict]:
+        """Serve a library index from cache, revalidating with conditional GETs."""
+        with self._cache_lock:
+            if time.monotonic() - cache["ts"] < self._ttl:
+                return cache["index"]
+            headers = {}
+            if cache["etag"]:
+                headers["If-None-Match"] = cache["etag"]
+            if cache["last_modified"]:
+                headers["If-Modified-Since"] = cache["last_modified"]
+
+        # includeImages=false trims the cover-art blobs the checks never
+        # read; servers that don't know the param ignore it
+        params = {"apikey": api_key, "includeImages": "false"}
+        with self.session.get(url, params=params, headers=headers,
+                              stream=ijson is not None, timeout=10) as response:
+            if response.status_code == 304:
+                # Library unchanged: keep the parsed index, just restart the TTL
+                with self._cache_lock:
+                    cache["ts"] = time.monotonic()
+                    return cache["index"]
+            response.raise_for_status()
+            if ijson is not None:
+                # Build the index one item at a time: peak memory is one
+                # entry plus the index, not the whole decoded array.
+                response.raw.decode_content = True
+                items = ijson.items(response.raw, "item")
+            else:
+                items = response.json()
+            index = {item[id_key]: item for item in items if item.get(id_key) is not None}
+        with self._cache_lock:
+            cache.update(
+                ts=time.monotonic(),
+                index=index,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return index
+
+    def _get_movies(self) -> Dict[int, Dict]:
+        """Return the Radarr library indexed by tmdbId, refreshing if stale."""
+        return self._refresh_library(
+            self._movie_cache, f"{self.radarr_url}/api/v3/movie", self.radarr_key, "tmdbId"
+        )
+
+    def _get_series(self) -> Dict[int, Dict]:
+        """Return the Sonarr library indexed by tvdbId, refreshing if stale."""
+        return self._refresh_library(
+            self._series_cache, f"{self.sonarr_url}/api/v3/series", self.sonarr_key, "tvdbId"
+        )
+
+    def _get_episodes(self, series_id: int) -> list:
+        """Return the episode list for a series, cached with the same TTL."""
+        with self._cache_lock:
+            cached = self._episode_cache.get(series_id)
+            if cached and time.monotonic() - cached[0] < self._ttl:
+                return cached[1]
+        url = f"{self.sonarr_url}/api/v3/episode"
+        # Only hasFile/seasonNumber are read — skip images and the embedded
+        # episodeFile objects
+        params = {
+            "apikey": self.sonarr_key,
+            "seriesId": series_id,
+            "includeImages": "false",
+            "includeEpisodeFile": "false",
+        }
+        response = self.session.get(url, params=params, timeout=10)
+        response.raise_for_status()
+        episodes = response.json()
+        with self._cache_lock:
+            self._episode_cache[series_id] = (time.monotonic(), episodes)
+        return episodes
+
+
+    @retry_on_failure(max_retries=3, backoff_factor=2, bucket="radarr")
     def check_movie_availability(self, tmdb_id: int) -> Tuple[bool, Optional[Dict]]:
         """
         Check if a movie is available in Radarr.
@@ -56,16 +222,8 @@ class RadarrSonarrAPI:
             movie_data: Dict with movie info if found, None otherwise
         """
         try:
-            url = f"{self.radarr_url}/api/v3/movie"
-            params = {"apikey": self.radarr_key}
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            movies = response.json()
-            
-            # Find movie by tmdbId
-            movie = next((m for m in movies if m.get("tmdbId") == tmdb_id), None)
-            
+            movie = self._get_movies().get(tmdb_id)
+
             if not movie:
                 logger.debug(f"Movie tmdbid={tmdb_id} not found in Radarr")
                 return False, None
@@ -84,7 +242,7 @@ class RadarrSonarrAPI:
             logger.exception(f"Error checking Radarr for tmdbid={tmdb_id}: {e}")
             return False, None
     
-    @retry_on_failure(max_retries=3, backoff_factor=2)
+    @retry_on_failure(max_retries=3, backoff_factor=2, bucket="sonarr")
     def check_tv_availability(self, tvdb_id: int, season_number: Optional[int] = None) -> Tuple[bool, Optional[Dict]]:
         """
         Check if a TV show (or specific season) is available in Sonarr.
@@ -99,30 +257,15 @@ class RadarrSonarrAPI:
             show_data: Dict with show info if found, None otherwise
         """
         try:
-            url = f"{self.sonarr_url}/api/v3/series"
-            params = {"apikey": self.sonarr_key}
-            
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            series = response.json()
-            
-            # Find show by tvdbId
-            show = next((s for s in series if s.get("tvdbId") == tvdb_id), None)
-            
+            show = self._get_series().get(tvdb_id)
+
             if not show:
                 logger.debug(f"TV show tvdbid={tvdb_id} not found in Sonarr")
                 return False, None
-            
-            series_id = show.get("id")
-            
-            # Get episode information
-            episodes_url = f"{self.sonarr_url}/api/v3/episode"
-            episodes_params = {"apikey": self.sonarr_key, "seriesId": series_id}
-            
-            episodes_response = self.session.get(episodes_url, params=episodes_params, timeout=10)
-            episodes_response.raise_for_status()
-            episodes = episodes_response.json()
-            
+
+            episodes = self._get_episodes(show.get("id"))
+
+
             if season_number is not None:
                 # Check specific season
                 season_episodes = [ep for ep in episodes if ep.get("seasonNumber") == season_number]
@@ -161,15 +304,92 @@ class RadarrSonarrAPI:
             logger.exception(f"Error checking Sonarr for tvdbid={tvdb_id}: {e}")
             return False, None
 
+    @retry_on_failure(max_retries=3, backoff_factor=2, bucket="radarr")
+    def check_movies_bulk(self, tmdb_ids: Iterable[int]) -> Dict[int, Tuple[bool, Optional[Dict]]]:
+        """
+        Check many movies against one library fetch.
+
+        Returns {tmdb_id: (is_available, movie_data)} — data is None for
+        movies Radarr doesn't know about.
+        """
+        movies = self._get_movies()
+        results = {}
+        for tmdb_id in tmdb_ids:
+            movie = movies.get(tmdb_id)
+            results[tmdb_id] = (bool(movie and movie.get("hasFile", False)), movie)
+        return results
+
+    @retry_on_failure(max_retries=3, backoff_factor=2, bucket="sonarr")
+    def check_tv_bulk(self, items: Iterable[Tuple[int, Optional[int]]]) -> Dict[Tuple[int, Optional[int]], Tuple[bool, Optional[Dict]]]:
+        """
+        Check many (tvdb_id, season_number) pairs against one /series fetch.
+
+        Episode lists for the affected shows are fetched on a small thread
+        pool (at most once per series thanks to the TTL cache), then each
+        pair is answered from memory. season_number=None means "any episode
+        on disk". Returns {(tvdb_id, season_number): (is_available, show_data)}.
+        """
+        items = list(items)
+        series = self._get_series()
+        series_ids = {series[tvdb].get("id") for tvdb, _ in items if tvdb in series}
+        if series_ids:
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(self._get_episodes, series_ids))
+
+        results = {}
+        for tvdb_id, season_number in items:
+            show = series.get(tvdb_id)
+            if not show:
+                results[(tvdb_id, season_number)] = (False, None)
+                continue
+            episodes = self._get_episodes(show.get("id"))
+            if season_number is not None:
+                season_episodes = [ep for ep in episodes if ep.get("seasonNumber") == season_number]
+                with_files = sum(1 for ep in season_episodes if ep.get("hasFile", False))
+                is_available = bool(season_episodes) and with_files == len(season_episodes)
+            else:
+                is_available = any(ep.get("hasFile", False) for ep in episodes)
+            results[(tvdb_id, season_number)] = (is_available, show)
+        return results
+
+    # Awaitable variants, mirroring PostgresChecker: the sync methods run in
+    # worker threads so async handlers can await or gather them directly.
+
+    async def check_movie_availability_async(self, tmdb_id: int) -> Tuple[bool, Optional[Dict]]:
+        """Awaitable wrapper around check_movie_availability."""
+        return await asyncio.to_thread(self.check_movie_availability, tmdb_id)
+
+    async def check_tv_availability_async(self, tvdb_id: int,
+                                          season_number: Optional[int] = None) -> Tuple[bool, Optional[Dict]]:
+        """Awaitable wrapper around check_tv_availability."""
+        return await asyncio.to_thread(self.check_tv_availability, tvdb_id, season_number=season_number)
+
 
 # Global instance
 _radarr_sonarr_api: Optional[RadarrSonarrAPI] = None
 
 
+def _refresh_loop(api: RadarrSonarrAPI):
+    """
+    Keep the library caches warm so no user interaction pays the cold
+    fetch. Refreshes just inside the TTL; transient failures are logged
+    and retried on the next cycle.
+    """
+    interval = api._ttl * 0.8
+    while True:
+        try:
+            api._get_movies()
+            api._get_series()
+        except Exception as e:
+            logger.warning(f"Library cache refresh failed (will retry): {e}")
+        time.sleep(interval)
+
+
 def init_radarr_sonarr_api(radarr_url: str, radarr_key: str, sonarr_url: str, sonarr_key: str):
-    """Initialize the global RadarrSonarrAPI instance."""
+    """Initialize the global RadarrSonarrAPI instance and prewarm its caches."""
     global _radarr_sonarr_api
     _radarr_sonarr_api = RadarrSonarrAPI(radarr_url, radarr_key, sonarr_url, sonarr_key)
+    threading.Thread(target=_refresh_loop, args=(_radarr_sonarr_api,), daemon=True).start()
     logger.info(f"RadarrSonarrAPI initialized: {radarr_url}, {sonarr_url}")
 
 
@@ -9,6 +9,7 @@ Refactored modular version with separated concerns:
 - overseerr_api.py: Overseerr API integration
 """
 
+import asyncio
 import logging
 from telegram.ext import (
     Application,
@@ -48,17 +49,9 @@ from handlers import (
     browse_popular,
     backup_database_command,
     restore_database_command,
-    delete_request_handler,
-    button_handler,
-    library_handler,
-    season_handler,
-    confirm_handler,
-    cancel_handler,
+    callback_dispatch,
     inline_search,
     inlineopen_handler,
-    recommend_handler,
-    openrec_handler,
-    asklib_wrapper,
 )
 
 # Import availability checker
@@ -70,6 +63,9 @@ from health_check import start_health_check_server, get_health_status
 # Import backup
 from backup import scheduled_backup
 
+# Import background database tasks
+from database import run_store_flusher, run_log_writer
+
 # Configure logging
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
@@ -78,13 +74,42 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Command → handler table; registration below is one loop over this
+COMMAND_HANDLERS = (
+    ("start", start),
+    ("stats", stats_command),
+    ("searchmovie", search_movie),
+    ("searchtv", search_tv),
+    ("myrequests", my_requests),
+    ("pending", pending_requests),
+    ("status", request_status),
+    ("browse", browse_popular),
+    ("backup", backup_database_command),
+    ("restore", restore_database_command),
+    ("checknow", checknow_command),
+)
+
+
+async def _post_init(application):
+    """Start background tasks on the bot's event loop."""
+    await start_health_check_server(port=HEALTH_CHECK_PORT)
+    asyncio.create_task(run_store_flusher())
+    asyncio.create_task(run_log_writer())
+
+
 def main():
     """Start the bot."""
     logger.info("Starting Telegram Overseerr Bot...")
 
-    # Start health check server
-    start_health_check_server(port=HEALTH_CHECK_PORT)
-    
+    # uvloop roughly doubles asyncio throughput on Linux; install it before
+    # PTB creates its event loop. Optional — the bot runs fine without it.
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("✅ uvloop installed as the event loop policy")
+    except ImportError:
+        pass
+
     # Initialize Postgres checker if enabled
     if POSTGRES_ENABLED:
         try:
@@ -116,31 +141,15 @@ def main():
             logger.warning(f"Could not initialize RadarrSonarrAPI: {e}")
 
     # Create application
-    application = Application.builder().token(TELEGRAM_BOT_TOKEN).build()
-
-    # Register command handlers
-    application.add_handler(CommandHandler("start", start))
-    application.add_handler(CommandHandler("stats", stats_command))
-    application.add_handler(CommandHandler("searchmovie", search_movie))
-    application.add_handler(CommandHandler("searchtv", search_tv))
-    application.add_handler(CommandHandler("myrequests", my_requests))
-    application.add_handler(CommandHandler("pending", pending_requests))
-    application.add_handler(CommandHandler("status", request_status))
-    application.add_handler(CommandHandler("browse", browse_popular))
-    application.add_handler(CommandHandler("backup", backup_database_command))
-    application.add_handler(CommandHandler("restore", restore_database_command))
-    application.add_handler(CommandHandler("checknow", checknow_command))
-
-    # Register callback query handlers
-    application.add_handler(CallbackQueryHandler(button_handler, pattern=r"^(movie|tv):\d+$"))
-    application.add_handler(CallbackQueryHandler(asklib_wrapper, pattern=r"^asklib:"))
-    application.add_handler(CallbackQueryHandler(library_handler, pattern=r"^lib:"))
-    application.add_handler(CallbackQueryHandler(season_handler, pattern=r"^season:"))
-    application.add_handler(CallbackQueryHandler(confirm_handler, pattern=r"^confirm:"))
-    application.add_handler(CallbackQueryHandler(cancel_handler, pattern=r"^cancel$"))
-    application.add_handler(CallbackQueryHandler(recommend_handler, pattern=r"^recommend:"))
-    application.add_handler(CallbackQueryHandler(openrec_handler, pattern=r"^openrec:"))
-    application.add_handler(CallbackQueryHandler(delete_request_handler, pattern=r"^delreq:"))
+    application = Application.builder().token(TELEGRAM_BOT_TOKEN).post_init(_post_init).build()
+
+    # Register command handlers from one table
+    for command, handler in COMMAND_HANDLERS:
+        application.add_handler(CommandHandler(command, handler))
+
+    # Register a single callback query handler; handlers.callback_dispatch
+    # routes on the data prefix with one dict lookup per click
+    application.add_handler(CallbackQueryHandler(callback_dispatch))
 
     # Register inline query handler
     application.add_handler(InlineQueryHandler(inline_search))
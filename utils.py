@@ -4,13 +4,24 @@ Utility functions for media processing, availability checks, and formatting.
 """
 import logging
 import requests
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, List, Optional, Tuple
 
 from config import TMDB_API_KEY, POSTGRES_ENABLED
 
 logger = logging.getLogger(__name__)
 
+# Shared session for TMDB calls: keep-alive pooling avoids a fresh TLS
+# handshake on every fallback fetch
+_TMDB_SESSION = requests.Session()
+_tmdb_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+_TMDB_SESSION.mount('http://', _tmdb_adapter)
+_TMDB_SESSION.mount('https://', _tmdb_adapter)
+
 # Lazy import to avoid circular dependencies
 _postgres_checker = None
 
@@ -27,26 +38,75 @@ def _get_postgres_checker():
     return _postgres_checker if _postgres_checker is not False else None
 
 
+class _TTLCache:
+    """
+    Minimal lock-guarded TTL cache with LRU eviction. Kept in-repo rather
+    than pulling in cachetools for two dicts.
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            ts, value = entry
+            if time.monotonic() - ts > self._ttl:
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+_MISS = object()
+
+# Handlers re-check the same title within seconds (poster render, season
+# picker, confirm). Short TTLs keep those repeats off Postgres and TMDB
+# without letting availability answers go meaningfully stale.
+_AVAIL_CACHE = _TTLCache(maxsize=4096, ttl=60)
+_TMDB_CACHE = _TTLCache(maxsize=4096, ttl=300)
+_TMDB_SEARCH_CACHE = _TTLCache(maxsize=1024, ttl=300)
+
+
 # ============================================================================
 # Date/Year Extraction
 # ============================================================================
 
+def normalize_item(it: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Collapse API naming variants into single keys, so consumers do one
+    lookup instead of chaining camelCase/snake_case fallbacks per field.
+    """
+    it["_title"] = it.get("title") or it.get("name") or "Unknown"
+    it["_date"] = (it.get("releaseDate") or it.get("release_date")
+                   or it.get("firstAirDate") or it.get("first_air_date"))
+    it["_poster"] = it.get("posterPath") or it.get("poster_path")
+    return it
+
+
 def safe_year(date_str: Optional[str]) -> Optional[str]:
-    """Extract year from a date string (YYYY-MM-DD or YYYY format)."""
-    if not date_str:
+    """
+    Extract year from a date string (YYYY-MM-DD or YYYY format).
+
+    Only the leading four digits matter, so slice them directly —
+    strptime built a full datetime (and raised on the fallback path) just
+    to read the year, and this runs per item in list renders.
+    """
+    if not date_str or not isinstance(date_str, str) or len(date_str) < 4:
         return None
-    
-    # Try parsing full date
-    try:
-        return str(datetime.strptime(date_str, "%Y-%m-%d").year)
-    except Exception:
-        pass
-    
-    # Try extracting first 4 digits
-    if isinstance(date_str, str) and len(date_str) >= 4 and date_str[:4].isdigit():
-        return date_str[:4]
-    
-    return None
+    year = date_str[:4]
+    return year if year.isdigit() else None
 
 
 def title_with_year_from_details(details: Dict[str, Any], media_type: str) -> str:
@@ -65,14 +125,56 @@ def title_with_year_from_details(details: Dict[str, Any], media_type: str) -> st
 # Availability Detection
 # ============================================================================
 
+# Statuses that count as "available" (Overseerr MediaStatus enum and strings)
+_AVAILABLE_STATUS_STRINGS = frozenset({"AVAILABLE", "PARTIALLY_AVAILABLE", "READY"})
+_AVAILABLE_STATUS_NUMS = frozenset({3, 4})  # PARTIALLY_AVAILABLE, AVAILABLE
+
+
+def _norm_status(raw: Any) -> Tuple[str, Optional[int]]:
+    """
+    Normalize an Overseerr status (int enum, numeric string, or name) to
+    (upper_string, int_or_None) without raising — the int()-in-try/except
+    this replaces ran several times per show in the availability sweep.
+    """
+    if raw is None:
+        return "", None
+    if isinstance(raw, int):
+        return str(raw), raw
+    s = str(raw)
+    return s.upper(), (int(s) if s.isdigit() else None)
+
 def is_available(
     details: Dict[str, Any],
     media_type: str,
     season_number: Optional[int] = None
+) -> bool:
+    """
+    Cached front of _is_available_uncached: answers keyed on
+    (media_type, tmdb id, season) are held for 60s so repeated checks for
+    the same title skip the Postgres/Overseerr round-trips. Items without
+    a usable id bypass the cache.
+    """
+    tmdb_id = details.get("tmdbId") or details.get("id")
+    if not tmdb_id:
+        return _is_available_uncached(details, media_type, season_number)
+
+    key = (media_type, int(tmdb_id), season_number)
+    cached = _AVAIL_CACHE.get(key, _MISS)
+    if cached is not _MISS:
+        return cached
+    result = _is_available_uncached(details, media_type, season_number)
+    _AVAIL_CACHE.set(key, result)
+    return result
+
+
+def _is_available_uncached(
+    details: Dict[str, Any],
+    media_type: str,
+    season_number: Optional[int] = None
 ) -> bool:
     """
     Robust availability check with Postgres database integration.
-    
+
     Checks (in order):
     1. Postgres database (if enabled) - actual Radarr/Sonarr data
     2. Overseerr API status - fallback if Postgres unavailable
@@ -123,72 +225,40 @@ def is_available(
     media_info = details.get("mediaInfo") or details.get("media") or {}
     
     # Normalize status from Overseerr (string OR numeric)
-    status_raw = media_info.get("status")
-    status_str = str(status_raw).upper() if status_raw is not None else ""
-    status_num = None
-    try:
-        status_num = int(status_raw)
-    except Exception:
-        pass
-    
+    status_str, status_num = _norm_status(media_info.get("status"))
+
     def is_available_status(s_str: str, s_num: Optional[int]) -> bool:
         """Check if a status indicates availability."""
-        # Numeric enum: 4 = AVAILABLE, 3 = PARTIALLY_AVAILABLE
-        if s_num in (3, 4):
-            return True
-        # String enum
-        if s_str in {"AVAILABLE", "PARTIALLY_AVAILABLE", "READY"}:
-            return True
-        return False
-    
+        return s_num in _AVAILABLE_STATUS_NUMS or s_str in _AVAILABLE_STATUS_STRINGS
+
+
     # TV: check specific season if requested
     if media_type == "tv":
         seasons = details.get("seasons") or []
-        
+
+        def season_available(s: Dict[str, Any]) -> bool:
+            """One shared predicate instead of the ladder both branches carried."""
+            s_str, s_num = _norm_status(s.get("status"))
+            ep_avail = s.get("episodesAvailable")
+            ep_total = s.get("episodeCount")
+            return (is_available_status(s_str, s_num) or
+                    (isinstance(ep_avail, int) and isinstance(ep_total, int) and
+                     ep_total > 0 and ep_avail >= ep_total))
+
         if season_number is not None:
-            # Check the specific season
-            for s in seasons:
-                if int(s.get("seasonNumber", -1)) == int(season_number):
-                    s_raw = s.get("status")
-                    s_str = str(s_raw).upper() if s_raw is not None else ""
-                    s_num = None
-                    try:
-                        s_num = int(s_raw)
-                    except Exception:
-                        pass
-                    
-                    # Check episode availability
-                    ep_avail = s.get("episodesAvailable")
-                    ep_total = s.get("episodeCount")
-                    
-                    if (is_available_status(s_str, s_num) or
-                        (isinstance(ep_avail, int) and isinstance(ep_total, int) and 
-                         ep_total > 0 and ep_avail >= ep_total)):
-                        return True
-            
+            # Check the specific season; index once so the lookup is one get
+            seasons_by_num = {int(s.get("seasonNumber", -1)): s for s in seasons}
+            s = seasons_by_num.get(int(season_number))
+            if s is not None and season_available(s):
+                return True
             # Season not found or not available, check media-level status
             return is_available_status(status_str, status_num)
-        else:
-            # No specific season: check if ANY season is available
-            for s in seasons:
-                s_raw = s.get("status")
-                s_str = str(s_raw).upper() if s_raw is not None else ""
-                s_num = None
-                try:
-                    s_num = int(s_raw)
-                except Exception:
-                    pass
-                
-                ep_avail = s.get("episodesAvailable")
-                ep_total = s.get("episodeCount")
-                
-                if (is_available_status(s_str, s_num) or
-                    (isinstance(ep_avail, int) and isinstance(ep_total, int) and 
-                     ep_total > 0 and ep_avail >= ep_total)):
-                    return True
-            
-            return is_available_status(status_str, status_num)
-    
+
+        # No specific season: available if ANY season is
+        if any(season_available(s) for s in seasons):
+            return True
+        return is_available_status(status_str, status_num)
+
     # Movies: media-level status is enough
     if is_available_status(status_str, status_num):
         return True
@@ -205,6 +275,30 @@ def is_available(
     return False
 
 
+def is_available_batch(
+    items: List[Tuple[Dict[str, Any], str, Optional[int]]],
+    max_workers: int = 8,
+) -> List[bool]:
+    """
+    Run is_available over many (details, media_type, season_number) tuples
+    on a bounded thread pool, so the blocking Postgres/HTTP checks overlap
+    instead of summing. Results come back in input order; a check that
+    raises counts as not available.
+    """
+    if not items:
+        return []
+
+    def _one(item):
+        try:
+            return is_available(*item)
+        except Exception:
+            logger.exception("is_available failed for %r", item[1:])
+            return False
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as ex:
+        return list(ex.map(_one, items))
+
+
 # ============================================================================
 # IMDb URL Extraction
 # ============================================================================
@@ -217,22 +311,26 @@ def imdb_url_from_details(details: Dict[str, Any]) -> Optional[str]:
     if not details or not isinstance(details, dict):
         return None
     
-    # Direct field
+    # Direct field, then nested external ids
     imdb_id = details.get("imdbId") or details.get("imdb_id")
-    
+
     if not imdb_id:
-        # Nested external ids
         ext = details.get("externalIds") or details.get("external_ids") or {}
         if isinstance(ext, dict):
             imdb_id = ext.get("imdb_id") or ext.get("imdbId") or ext.get("imdb")
-    
-    if imdb_id and isinstance(imdb_id, str) and imdb_id.startswith("tt"):
+
+    # Single type guard instead of re-checking per branch — this runs once
+    # per item in list renders
+    if not isinstance(imdb_id, str) or not imdb_id:
+        return None
+
+    if imdb_id.startswith("tt"):
         return f"https://www.imdb.com/title/{imdb_id}"
-    
-    if imdb_id and isinstance(imdb_id, str) and imdb_id.isdigit():
+
+    if imdb_id.isdigit():
         # Numeric IMDb ID (rare but possible)
         return f"https://www.imdb.com/title/tt{imdb_id.zfill(7)}"
-    
+
     return None
 
 
@@ -248,7 +346,12 @@ def get_tmdb_details_or_none(tmdb_id: int, media_type: str) -> Optional[Dict]:
     if not TMDB_API_KEY:
         logger.warning("TMDB_API_KEY not configured, cannot fetch TMDB details")
         return None
-    
+
+    cache_key = (media_type, tmdb_id)
+    cached = _TMDB_CACHE.get(cache_key, _MISS)
+    if cached is not _MISS:
+        return cached
+
     try:
         typ = "movie" if media_type == "movie" else "tv"
         url = f"https://api.themoviedb.org/3/{typ}/{tmdb_id}"
@@ -258,10 +361,10 @@ def get_tmdb_details_or_none(tmdb_id: int, media_type: str) -> Optional[Dict]:
             "append_to_response": "videos,external_ids"
         }
         
-        r = requests.get(url, params=params, timeout=6)
+        r = _TMDB_SESSION.get(url, params=params, timeout=6)
         r.raise_for_status()
         j = r.json()
-        
+
         # Normalize structure
         details = {
             "id": j.get("id"),
@@ -281,9 +384,11 @@ def get_tmdb_details_or_none(tmdb_id: int, media_type: str) -> Optional[Dict]:
             "voteAverage": j.get("vote_average"),
             "tagline": j.get("tagline"),
         }
-        
+
+        _TMDB_CACHE.set(cache_key, details)
         return details
     except Exception as e:
+        # Failures are not cached — the next call gets a fresh attempt
         logger.error(f"TMDB fetch failed for {media_type} {tmdb_id}: {e}")
         return None
 
@@ -295,7 +400,12 @@ def tmdb_search(query: str, media_type: str, limit: int = 5) -> List[Dict]:
     """
     if not TMDB_API_KEY:
         return []
-    
+
+    cache_key = (media_type, query.strip().lower(), limit)
+    cached = _TMDB_SEARCH_CACHE.get(cache_key, _MISS)
+    if cached is not _MISS:
+        return cached
+
     try:
         typ = "movie" if media_type == "movie" else "tv"
         url = f"https://api.themoviedb.org/3/search/{typ}"
@@ -306,13 +416,13 @@ def tmdb_search(query: str, media_type: str, limit: int = 5) -> List[Dict]:
             "page": 1
         }
         
-        r = requests.get(url, params=params, timeout=6)
+        r = _TMDB_SESSION.get(url, params=params, timeout=6)
         r.raise_for_status()
         j = r.json()
-        
+
         results = []
         for item in j.get("results", [])[:limit]:
-            results.append({
+            results.append(normalize_item({
                 "id": item.get("id"),
                 "title": item.get("title") or item.get("name"),
                 "name": item.get("name"),
@@ -320,8 +430,9 @@ def tmdb_search(query: str, media_type: str, limit: int = 5) -> List[Dict]:
                 "releaseDate": item.get("release_date"),
                 "firstAirDate": item.get("first_air_date"),
                 "media_type": media_type,
-            })
-        
+            }))
+
+        _TMDB_SEARCH_CACHE.set(cache_key, results)
         return results
     except Exception as e:
         logger.error(f"TMDB search failed for '{query}' ({media_type}): {e}")